@@ -30,8 +30,8 @@ Invariants:
 4. All derivations explicit and documented
 """
 
-from typing import Dict, Any
-from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional
+from datetime import date
 from repositories.protocols import Case
 
 
@@ -43,7 +43,7 @@ class ContextBuilder:
     """
     
     @staticmethod
-    def build(case: Case) -> Dict[str, Any]:
+    def build(case: Case, *, today: Optional[date] = None) -> Dict[str, Any]:
         """
         Build context dictionary from case data.
         
@@ -52,6 +52,11 @@ class ContextBuilder:
         case : Case
             Source case data
             
+        today : date, optional
+            Reference date for derived fields (defaults to date.today()).
+            Batch callers pass one snapshot so every case in the batch
+            is measured against the same day.
+            
         Returns:
         --------
         dict
@@ -88,17 +93,44 @@ class ContextBuilder:
         
         # Compute derived fields (example: days_open)
         # NOTE: Only add this if created_at exists in case.data
-        if "created_at" in case.data:
+        # (EAFP: one lookup instead of a membership test plus a lookup)
+        try:
+            created_at = case.data["created_at"]
+        except KeyError:
+            pass
+        else:
             context["days_open"] = ContextBuilder._compute_days_open(
-                case.data["created_at"]
+                created_at,
+                date.today() if today is None else today,
             )
         
         return context
     
     @staticmethod
-    def _compute_days_open(created_at: str) -> int:
+    def build_many(cases: Iterable[Case]) -> List[Dict[str, Any]]:
         """
-        Compute days between creation and now.
+        Build contexts for a batch of cases.
+        
+        The clock is read ONCE per batch, so every context in the
+        batch shares the same reference date.
+        
+        Parameters:
+        -----------
+        cases : iterable of Case
+            Source cases
+            
+        Returns:
+        --------
+        list[dict]
+            One context per case, in input order
+        """
+        today = date.today()
+        return [ContextBuilder.build(case, today=today) for case in cases]
+    
+    @staticmethod
+    def _compute_days_open(created_at: str, today: date) -> int:
+        """
+        Compute days between creation and today.
         
         This is an example of explicit derivation.
         All such computations should be:
@@ -109,16 +141,17 @@ class ContextBuilder:
         Parameters:
         -----------
         created_at : str
-            ISO format date string
+            ISO format date or datetime string (only the date part is used)
+            
+        today : date
+            Reference date
             
         Returns:
         --------
         int
             Number of days case has been open
         """
-        created = datetime.fromisoformat(created_at)
-        now = datetime.now()
-        delta = now - created
-        return delta.days
+        created = date.fromisoformat(created_at[:10])
+        return (today - created).days
 
 
@@ -23,6 +23,8 @@ This file must NOT:
 If you feel tempted to add logic here, you are breaking the architecture.
 """
 
+from typing import Callable, Mapping
+
 
 class GuardViolation(Exception):
     """
@@ -85,6 +87,65 @@ def evaluate_guards(required_guards: dict, facts: dict) -> None:
         # 1. Fact is missing
         # 2. Fact exists but value does not match expectation
         if actual_value != expected_value:
-            raise GuardViolation(
-                f"Guard failed: '{guard_key}' expected={expected_value}, actual={actual_value}"
-            )
+            raise _violation(guard_key, expected_value, actual_value)
+
+
+def compile_guards(required_guards: Mapping) -> Callable[[dict], None]:
+    """
+    Compiles a guard mapping into a checker: checker(facts) -> None.
+
+    The checker behaves exactly like evaluate_guards(required_guards, facts)
+    (same comparisons, same order, same GuardViolation message), but the
+    guard items are captured once instead of walked through a dict view on
+    every call. Single-guard transitions (the common case) get a
+    specialised checker with no loop at all; multi-guard checkers compare
+    all facts against the expected values in one tuple comparison and
+    only loop when something fails.
+
+    Parameters:
+    -----------
+    required_guards : Mapping
+        fact_name -> expected_value, as in evaluate_guards.
+
+    Returns:
+    --------
+    Callable[[dict], None]
+        Raises GuardViolation on the first unsatisfied guard.
+    """
+
+    items = tuple(required_guards.items())
+
+    if len(items) == 1:
+        ((guard_key, expected_value),) = items
+
+        def check_one(facts: dict) -> None:
+            actual_value = facts.get(guard_key)
+            if actual_value != expected_value:
+                raise _violation(guard_key, expected_value, actual_value)
+
+        return check_one
+
+    # Guard keys and expected values staged as parallel tuples, so the
+    # happy path is one C-level tuple comparison instead of a Python loop
+    guard_keys = tuple(guard_key for guard_key, _ in items)
+    expected_values = tuple(expected_value for _, expected_value in items)
+
+    def check_all(facts: dict) -> None:
+        if tuple(map(facts.get, guard_keys)) == expected_values:
+            return
+
+        # Cold path: walk the guards to report the first violation
+        get = facts.get
+        for guard_key, expected_value in items:
+            actual_value = get(guard_key)
+            if actual_value != expected_value:
+                raise _violation(guard_key, expected_value, actual_value)
+
+    return check_all
+
+
+def _violation(guard_key, expected_value, actual_value) -> GuardViolation:
+    """Builds the GuardViolation for one failed guard (cold path)."""
+    return GuardViolation(
+        f"Guard failed: '{guard_key}' expected={expected_value}, actual={actual_value}"
+    )
@@ -3,10 +3,11 @@ rule_engine.py
 
 Purpose:
 --------
-Pure recursive evaluator for JSON condition trees.
+Compiling evaluator for JSON condition trees.
 
 This module:
-- Evaluates condition ASTs
+- Compiles condition ASTs into evaluator closures
+- Evaluates compiled conditions
 - Produces boolean results
 - Raises explicit domain exceptions
 - Has ZERO side effects
@@ -19,7 +20,7 @@ It does NOT:
 
 Invariants:
 -----------
-1. Purely recursive AST traversal
+1. Condition trees are validated and compiled once, then evaluated
 2. Operator-registry driven comparisons
 3. Explicit raising of domain exceptions (no generic errors)
 4. Context is treated as read-only
@@ -29,7 +30,19 @@ Invariants:
 8. Rule definition validity is checked BEFORE evaluation
 """
 
-from typing import Any, Dict, List, Callable
+import operator as _op
+import sys
+from types import MappingProxyType
+from typing import Any, Dict, Final, Iterable, List, Callable, Mapping, Optional, Tuple, Union
+
+
+# Compiled form of a condition tree: fn(context) -> bool
+CompiledCondition = Callable[[Dict[str, Any]], bool]
+
+# CompiledRuleSet entry:
+# (rule_id, priority, condition, fact_key, fact_value, output_fact, status, error)
+_RuleEntry = Tuple[Any, Any, Optional[CompiledCondition], Any, Any,
+                   Optional[Dict[str, Any]], Optional[str], Optional[Dict[str, Any]]]
 
 
 # =============================================================================
@@ -74,44 +87,74 @@ class RuleEvaluationTypeError(RuleEngineError):
 # Operator Registry (Whitelist)
 # =============================================================================
 
-OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
-    "==": lambda a, b: a == b,
-    "!=": lambda a, b: a != b,
-    ">":  lambda a, b: a > b,
-    "<":  lambda a, b: a < b,
-    ">=": lambda a, b: a >= b,
-    "<=": lambda a, b: a <= b,
+# Frozen table of operator callables. Comparisons map straight onto the
+# C-implemented functions in the operator module (no lambda frame);
+# membership operators keep a lambda because their argument order differs
+# from operator.contains.
+OPERATORS: Final[Mapping[str, Callable[[Any, Any], bool]]] = MappingProxyType({
+    "==": _op.eq,
+    "!=": _op.ne,
+    ">":  _op.gt,
+    "<":  _op.lt,
+    ">=": _op.ge,
+    "<=": _op.le,
     "in": lambda a, b: a in b,
     "not_in": lambda a, b: a not in b,
+})
+
+
+# Sentinel for absent rule keys (distinguishes "missing" from None)
+_MISSING: Final = object()
+
+def _intern(value: Any) -> Any:
+    """sys.intern for strings; any other value is returned unchanged."""
+    return sys.intern(value) if type(value) is str else value
+
+
+# Base shape of every trace entry; copied (dict.copy, C-level) per rule
+_TRACE_TEMPLATE: Final[Dict[str, Any]] = {
+    "rule_id": None,
+    "priority": 0,
+    "evaluated": False,
+    "evaluation_status": None,
+    "condition_result": None,
+    "produced_fact": None,
+    "error": None,
 }
 
 
 # =============================================================================
-# Core Recursive Evaluator
+# Condition Compiler
 # =============================================================================
 
-def _evaluate_node(node: Dict[str, Any], context: Dict[str, Any]) -> bool:
+def compile_condition(
+    node: Dict[str, Any],
+    memo: Optional["_SubtreeMemo"] = None,
+) -> CompiledCondition:
     """
-    Recursively evaluates a JSON condition node.
+    Recursively compiles a JSON condition node into an evaluator closure.
 
     Parameters:
     -----------
     node : dict
         A condition node (logical or comparison).
 
-    context : dict
-        Snapshot of case data. Must be treated as read-only.
+    memo : _SubtreeMemo, optional
+        When given, structurally identical logical subtrees compile to
+        one shared closure whose result is memoized per context.
 
     Returns:
     --------
-    bool
-        Result of condition evaluation.
+    callable
+        fn(context) -> bool. The context must be treated as read-only.
 
     Raises:
     -------
     InvalidRuleDefinition
-        If the node structure or operator is invalid.
+        If the node structure or operator is invalid (at compile time).
 
+    The returned closure raises:
+    ----------------------------
     MissingContextField
         If a required field is not present in context.
 
@@ -120,6 +163,9 @@ def _evaluate_node(node: Dict[str, Any], context: Dict[str, Any]) -> bool:
 
     Notes:
     ------
+    - Schema validation runs ONCE per tree, not once per evaluation
+    - The whole tree is validated, including branches that evaluation
+      would short-circuit past
     - Evaluation is depth-first
     - Logical nodes short-circuit by design
     - Missing data is an ERROR, not False
@@ -129,6 +175,11 @@ def _evaluate_node(node: Dict[str, Any], context: Dict[str, Any]) -> bool:
     - No extraneous keys allowed
     """
 
+    if not isinstance(node, dict):
+        raise InvalidRuleDefinition(
+            f"Condition node must be a dict. Found: {type(node).__name__}"
+        )
+
     # -------------------------------------------------------------------------
     # GUARD: Prevent logical node ambiguity
     # -------------------------------------------------------------------------
@@ -156,7 +207,8 @@ def _evaluate_node(node: Dict[str, Any], context: Dict[str, Any]) -> bool:
     # -------------------------------------------------------------------------
     if has_all:
         # Enforce strict key schema
-        if set(node.keys()) != {"all"}:
+        # ('all' presence is already known, so a length check suffices)
+        if len(node) != 1:
             raise InvalidRuleDefinition(
                 f"Logical 'all' node must contain only the 'all' key. Found: {list(node.keys())}"
             )
@@ -168,16 +220,20 @@ def _evaluate_node(node: Dict[str, Any], context: Dict[str, Any]) -> bool:
                 "'all' node must contain a list of conditions"
             )
         
-        # Mathematical invariant: all([]) is True (vacuous truth)
-        # Python's all() handles short-circuiting natively
-        return all(_evaluate_node(child, context) for child in children)
+        if memo is not None:
+            return memo.shared(
+                node, lambda: _all([compile_condition(child, memo) for child in children])
+            )
+
+        return _all([compile_condition(child) for child in children])
 
     # -------------------------------------------------------------------------
     # BRANCH B: Logical OR (any)
     # -------------------------------------------------------------------------
     if has_any:
         # Enforce strict key schema
-        if set(node.keys()) != {"any"}:
+        # ('any' presence is already known, so a length check suffices)
+        if len(node) != 1:
             raise InvalidRuleDefinition(
                 f"Logical 'any' node must contain only the 'any' key. Found: {list(node.keys())}"
             )
@@ -189,19 +245,22 @@ def _evaluate_node(node: Dict[str, Any], context: Dict[str, Any]) -> bool:
                 "'any' node must contain a list of conditions"
             )
         
-        # Mathematical invariant: any([]) is False
-        # Python's any() handles short-circuiting natively
-        return any(_evaluate_node(child, context) for child in children)
+        if memo is not None:
+            return memo.shared(
+                node, lambda: _any([compile_condition(child, memo) for child in children])
+            )
+
+        return _any([compile_condition(child) for child in children])
 
     # -------------------------------------------------------------------------
     # BRANCH C: Comparison Leaf
     # -------------------------------------------------------------------------
     
     # Enforce strict key schema for leaf nodes
-    required_keys = {"field", "operator", "value"}
-    actual_keys = set(node.keys())
-    
-    if actual_keys != required_keys:
+    # (the pretty missing/extra key sets are only built on the error path)
+    if len(node) != 3 or not ("field" in node and "operator" in node and "value" in node):
+        required_keys = {"field", "operator", "value"}
+        actual_keys = set(node.keys())
         missing = required_keys - actual_keys
         extra = actual_keys - required_keys
         
@@ -220,6 +279,9 @@ def _evaluate_node(node: Dict[str, Any], context: Dict[str, Any]) -> bool:
     field = node["field"]
     operator = node["operator"]
     expected_value = node["value"]
+
+    # Interned field names let dict lookups match on identity first
+    field = _intern(field)
     
     # Guard 1: Operator Whitelist
     if operator not in OPERATORS:
@@ -228,139 +290,341 @@ def _evaluate_node(node: Dict[str, Any], context: Dict[str, Any]) -> bool:
             f"Allowed operators: {list(OPERATORS.keys())}"
         )
     
-    # Guard 2: Context Integrity
-    if field not in context:
-        raise MissingContextField(
-            f"Field '{field}' not found in provided context. "
-            f"Available fields: {list(context.keys())}"
-        )
-    
-    actual_value = context[field]
-    
-    # Guard 3: Type/Execution Integrity
-    # ONLY catch TypeError - let everything else bubble (those are real bugs)
-    try:
-        return OPERATORS[operator](actual_value, expected_value)
-    except TypeError as e:
-        raise RuleEvaluationTypeError(
-            f"Type mismatch: cannot compare {type(actual_value).__name__} "
-            f"(actual) with {type(expected_value).__name__} (expected) "
-            f"using operator '{operator}'. Original error: {str(e)}"
-        )
+    # Specialization: literal membership lists become frozenset probes
+    if operator in ("in", "not_in") and isinstance(expected_value, (list, tuple)):
+        try:
+            members = frozenset(expected_value)
+        except TypeError:
+            pass  # Unhashable items: keep the generic sequence scan
+        else:
+            return _membership_leaf(
+                field, members, expected_value, negate=(operator == "not_in")
+            )
+
+    return _leaf(field, operator, OPERATORS[operator], expected_value)
 
 
 # =============================================================================
-# Public Rule Engine API
+# Compiled Node Closures
 # =============================================================================
 
-def evaluate_rules(*, context: Dict[str, Any], rules: List[Dict[str, Any]]) -> Dict[str, Any]:
+class _Logical:
     """
-    Public entry point for the Rule Engine.
+    Compiled all/any node.
 
-    Purpose:
-    --------
-    Evaluates a list of rules against a context snapshot and produces:
-    - a final set of facts
-    - a complete, ordered evaluation trace
+    A callable like every other CompiledCondition, but it exposes its
+    kind and (already flattened) children so a same-kind parent can
+    splice them in at compile time.
+    """
 
-    This function:
-    ----------------
-    - Sorts rules deterministically by priority
-    - Respects rule enable/disable flags
-    - Validates rule structure BEFORE evaluation
-    - Evaluates conditions via _evaluate_node
-    - Catches domain exceptions and converts them into trace entries
-    - NEVER mutates context
-    - NEVER raises rule-level exceptions outward
+    __slots__ = ("kind", "children")
 
-    Returns:
-    --------
-    {
-        "facts": dict,
-        "trace": list[dict]
-    }
+    def __init__(self, kind: str, children: List[CompiledCondition]):
+        self.kind = kind
+        self.children = children
 
-    Engine-level failures (invalid rules list structure) may still raise.
-    
-    Trace Status Values:
-    --------------------
-    - SKIPPED_DISABLED: Rule was disabled
-    - EVALUATED_TRUE: Condition evaluated to True, fact produced
-    - EVALUATED_FALSE: Condition evaluated to False
-    - FAILED_INVALID_DEFINITION: Rule structure or condition tree malformed
-    - FAILED_MISSING_CONTEXT: Required field not in context
-    - FAILED_TYPE_ERROR: Type mismatch during comparison
-    - FAILED_ENGINE_ERROR: Unexpected engine failure (should never happen)
+    def __call__(self, context: Dict[str, Any]) -> bool:
+        # Explicit loops: short-circuit without a generator frame
+        if self.kind == "all":
+            # Mathematical invariant: all([]) is True (vacuous truth)
+            for child in self.children:
+                if not child(context):
+                    return False
+            return True
+
+        # Mathematical invariant: any([]) is False
+        for child in self.children:
+            if child(context):
+                return True
+        return False
+
+
+def _flatten(kind: str, children: List[CompiledCondition]) -> List[CompiledCondition]:
     """
+    Splices same-kind logical children into their parent.
 
-    # -------------------------------------------------------------------------
-    # Pre-flight validation (engine-level, not rule-level)
-    # -------------------------------------------------------------------------
-    if not isinstance(rules, list):
-        raise InvalidRuleDefinition(
-            "Rules must be provided as a list of rule definitions"
-        )
+    all(a, all(b, c)) == all(a, b, c) and likewise for 'any', so nested
+    chains collapse into one n-ary loop. Depth-first order is kept, so
+    short-circuiting (and which error surfaces first) is unchanged.
+    Children are compiled bottom-up, so they are already flat.
+    """
+    flat: List[CompiledCondition] = []
+    for child in children:
+        if isinstance(child, _Logical) and child.kind == kind:
+            flat.extend(child.children)
+        else:
+            flat.append(child)
+    return flat
 
-    # -------------------------------------------------------------------------
-    # Deterministic ordering
-    # -------------------------------------------------------------------------
-    # Priority semantics:
-    # - Lower priority evaluated first
-    # - Higher priority evaluated later
-    # - Later rules may overwrite facts (last-write-wins)
-    sorted_rules = sorted(
-        rules,
-        key=lambda r: r.get("priority", 0)
+
+def _all(children: List[CompiledCondition]) -> CompiledCondition:
+    """Logical AND over precompiled children."""
+    return _Logical("all", _flatten("all", children))
+
+
+def _any(children: List[CompiledCondition]) -> CompiledCondition:
+    """Logical OR over precompiled children."""
+    return _Logical("any", _flatten("any", children))
+
+
+def _leaf(
+    field: Any,
+    operator: str,
+    op_fn: Callable[[Any, Any], bool],
+    expected_value: Any,
+) -> CompiledCondition:
+    """Comparison leaf with its operator resolved at compile time."""
+
+    def evaluate(context: Dict[str, Any]) -> bool:
+        # Guard 2: Context Integrity
+        try:
+            actual_value = context[field]
+        except KeyError:
+            raise _missing_field(field, context) from None
+
+        # Guard 3: Type/Execution Integrity
+        # ONLY catch TypeError - let everything else bubble (those are real bugs)
+        try:
+            return op_fn(actual_value, expected_value)
+        except TypeError as e:
+            raise RuleEvaluationTypeError(
+                f"Type mismatch: cannot compare {type(actual_value).__name__} "
+                f"(actual) with {type(expected_value).__name__} (expected) "
+                f"using operator '{operator}'. Original error: {str(e)}"
+            )
+
+    return evaluate
+
+
+def _membership_leaf(
+    field: Any,
+    members: frozenset,
+    values: Any,
+    *,
+    negate: bool,
+) -> CompiledCondition:
+    """
+    'in' / 'not_in' leaf against a literal list, probed as a frozenset.
+
+    O(1) hash probe instead of an O(N) scan. An unhashable actual value
+    cannot be probed, so it falls back to scanning the original values
+    (same result the generic operator would give).
+    """
+
+    def evaluate(context: Dict[str, Any]) -> bool:
+        # Guard 2: Context Integrity
+        try:
+            actual_value = context[field]
+        except KeyError:
+            raise _missing_field(field, context) from None
+
+        try:
+            found = actual_value in members
+        except TypeError:
+            found = actual_value in values
+
+        return not found if negate else found
+
+    return evaluate
+
+
+def _missing_field(field: Any, context: Dict[str, Any]) -> MissingContextField:
+    """Builds the MissingContextField error (cold path only)."""
+    return MissingContextField(
+        f"Field '{field}' not found in provided context. "
+        f"Available fields: {list(context.keys())}"
     )
 
-    final_facts: Dict[str, Any] = {}
-    trace: List[Dict[str, Any]] = []
 
-    # -------------------------------------------------------------------------
-    # Rule evaluation loop
-    # -------------------------------------------------------------------------
-    for rule in sorted_rules:
-        # Extract rule metadata safely
-        rule_id = rule.get("rule_id", "<unknown>")
-        priority = rule.get("priority", 0)
-        enabled = rule.get("enabled", True)
-
-        # Base trace entry (filled progressively)
-        trace_entry = {
-            "rule_id": rule_id,
-            "priority": priority,
-            "evaluated": False,
-            "evaluation_status": None,
-            "condition_result": None,
-            "produced_fact": None,
-            "error": None,
-        }
+# =============================================================================
+# Subtree Memoization
+# =============================================================================
+
+class _SubtreeMemo:
+    """
+    Shares logical subtrees between the conditions of one rule set.
+
+    Rules often repeat the same 'all'/'any' block. Each distinct block is
+    compiled once and evaluated at most once per context; leaves are not
+    memoized (a lookup would cost more than the comparison).
+
+    The memo is bound to ONE context at a time: results must be cleared
+    before evaluating against a different context.
+    """
+
+    __slots__ = ("_closures", "results")
+
+    def __init__(self) -> None:
+        self._closures: Dict[Any, CompiledCondition] = {}
+        self.results: Dict[Any, bool] = {}
+
+    def shared(
+        self,
+        node: Dict[str, Any],
+        build: Callable[[], CompiledCondition],
+    ) -> CompiledCondition:
+        """Return the shared closure for node, building it on first sight."""
+        try:
+            key = _structural_key(node)
+        except TypeError:
+            # Unhashable leaf values have no structural key: don't share
+            return build()
+
+        try:
+            return self._closures[key]
+        except KeyError:
+            pass
+
+        evaluate = build()
+        results = self.results
+
+        def memoized(context: Dict[str, Any]) -> bool:
+            try:
+                return results[key]
+            except KeyError:
+                result = results[key] = evaluate(context)
+                return result
+
+        self._closures[key] = memoized
+        return memoized
+
+
+def _structural_key(value: Any) -> Any:
+    """
+    Hashable key that is equal only for structurally identical nodes.
+
+    Every value is tagged with its exact type, so [1, 2] and (1, 2),
+    1 / 1.0 / True, or int and str dict keys never share a key (a JSON
+    dump would conflate them). Dicts become frozensets of pairs, so key
+    order does not matter and mixed key types need no sorting.
+
+    Raises:
+    -------
+    TypeError
+        If a leaf value is unhashable (other than dict / list / tuple).
+    """
+
+    kind = type(value)
+
+    if kind is dict:
+        return (dict, frozenset(
+            (_structural_key(k), _structural_key(v)) for k, v in value.items()
+        ))
+
+    if kind is list or kind is tuple:
+        return (kind, tuple(_structural_key(item) for item in value))
+
+    hash(value)
+    return (kind, value)
+
+
+# =============================================================================
+# Compiled Rule Set
+# =============================================================================
+
+class CompiledRuleSet:
+    """
+    A rule list that is sorted, validated and compiled ONCE,
+    then evaluated against any number of contexts.
+
+    Use this when the same rules are applied to many cases;
+    evaluate_rules() is the one-shot equivalent.
+
+    Notes:
+    ------
+    - The rules list is read at construction time only; later
+      mutation of the source dicts is NOT reflected
+    - With memoize=True the instance holds per-evaluation state and
+      must not be shared between threads
+    """
+
+    def __init__(self, rules: List[Dict[str, Any]], *, memoize: bool = False) -> None:
+        """
+        Parameters:
+        -----------
+        rules : list[dict]
+            Rule definitions in Rule Engine format.
+
+        memoize : bool
+            Share structurally identical 'all'/'any' subtrees across rules and
+            evaluate each at most once per context (worth it when rules
+            repeat blocks).
+
+        Raises:
+        -------
+        InvalidRuleDefinition
+            If rules is not a list (engine-level failure).
+        """
+
+        # ---------------------------------------------------------------------
+        # Pre-flight validation (engine-level, not rule-level)
+        # ---------------------------------------------------------------------
+        if not isinstance(rules, list):
+            raise InvalidRuleDefinition(
+                "Rules must be provided as a list of rule definitions"
+            )
+
+        # ---------------------------------------------------------------------
+        # Deterministic ordering
+        # ---------------------------------------------------------------------
+        # Priority semantics:
+        # - Lower priority evaluated first
+        # - Higher priority evaluated later
+        # - Later rules may overwrite facts (last-write-wins)
+        sorted_rules = sorted(
+            rules,
+            key=lambda r: r.get("priority", 0)
+        )
+
+        # Shared-subtree memo (opt-in); results are reset per context
+        self._memo = _SubtreeMemo() if memoize else None
+
+        # One entry per rule, in evaluation order:
+        # (rule_id, priority, condition, fact_key, fact_value, output_fact,
+        #  status, error)
+        # - condition is the compiled closure, or None when the rule's
+        #   outcome is static (definition failure or disabled); that
+        #   outcome is then precomputed in status/error
+        # - output_fact is pre-split into (fact_key, fact_value)
+        self._entries: List[_RuleEntry] = []
+
+        for rule in sorted_rules:
+            rule_id = _intern(rule.get("rule_id", "<unknown>"))
+            priority = rule.get("priority", 0)
+            self._entries.append(
+                (rule_id, priority) + self._compile_rule(rule, rule_id)
+            )
+
+        # Slim view for evaluate_facts_only: (condition, fact_key,
+        # fact_value) of the evaluable rules only, same order
+        self._fact_entries: List[Tuple[CompiledCondition, Any, Any]] = [
+            (condition, fact_key, fact_value)
+            for _, _, condition, fact_key, fact_value, _, _, _ in self._entries
+            if condition is not None
+        ]
+
+    def _compile_rule(self, rule: Dict[str, Any], rule_id: Any) -> tuple:
+        """
+        Runs every static check for one rule, in order, and compiles it.
+
+        Returns (condition, fact_key, fact_value, output_fact, status, error).
+        """
 
         # ---------------------------------------------------------------------
         # GUARD: Validate required structural keys
         # ---------------------------------------------------------------------
-        if "condition" not in rule:
-            trace_entry.update({
-                "evaluated": False,
-                "evaluation_status": "FAILED_INVALID_DEFINITION",
-                "error": {
-                    "type": "InvalidRuleDefinition",
-                    "message": "Rule missing required 'condition' key"
-                }
-            })
-            trace.append(trace_entry)
-            continue
+        condition_node = rule.get("condition", _MISSING)
+        if condition_node is _MISSING:
+            return None, None, None, None, "FAILED_INVALID_DEFINITION", {
+                "type": "InvalidRuleDefinition",
+                "message": "Rule missing required 'condition' key"
+            }
 
         # ---------------------------------------------------------------------
         # Skip disabled rules
         # ---------------------------------------------------------------------
-        if not enabled:
-            trace_entry.update({
-                "evaluated": False,
-                "evaluation_status": "SKIPPED_DISABLED",
-            })
-            trace.append(trace_entry)
-            continue
+        if not rule.get("enabled", True):
+            return None, None, None, None, "SKIPPED_DISABLED", None
 
         # ---------------------------------------------------------------------
         # GUARD: Validate output_fact structure BEFORE evaluation
@@ -369,95 +633,289 @@ def evaluate_rules(*, context: Dict[str, Any], rules: List[Dict[str, Any]]) -> D
         # Check this before wasting cycles on condition evaluation
         output_fact = rule.get("output_fact")
         if not isinstance(output_fact, dict) or len(output_fact) != 1:
-            trace_entry.update({
-                "evaluated": False,
-                "evaluation_status": "FAILED_INVALID_DEFINITION",
-                "error": {
-                    "type": "InvalidRuleDefinition",
-                    "message": (
-                        f"Rule '{rule_id}' must define output_fact "
-                        f"as a dict with exactly one key"
-                    )
-                }
-            })
-            trace.append(trace_entry)
-            continue
+            return None, None, None, None, "FAILED_INVALID_DEFINITION", {
+                "type": "InvalidRuleDefinition",
+                "message": (
+                    f"Rule '{rule_id}' must define output_fact "
+                    f"as a dict with exactly one key"
+                )
+            }
 
         # ---------------------------------------------------------------------
-        # Evaluate rule condition
+        # Compile rule condition (definition errors surface here)
         # ---------------------------------------------------------------------
         try:
-            result = _evaluate_node(rule["condition"], context)
+            condition = compile_condition(condition_node, self._memo)
+        except InvalidRuleDefinition as e:
+            return None, None, None, None, "FAILED_INVALID_DEFINITION", {
+                "type": "InvalidRuleDefinition",
+                "message": str(e),
+            }
+        except Exception as e:
+            # Safety net (see evaluate) - compilation must not escape either
+            return None, None, None, None, "FAILED_ENGINE_ERROR", {
+                "type": type(e).__name__,
+                "message": f"UNEXPECTED ENGINE ERROR (this is a bug): {str(e)}"
+            }
+
+        (fact_key, fact_value), = output_fact.items()
+        return condition, fact_key, fact_value, output_fact, None, None
+
+    def evaluate(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Evaluates the compiled rules against one context snapshot.
+
+        Returns:
+        --------
+        {
+            "facts": dict,
+            "trace": list[dict]
+        }
+
+        See evaluate_rules() for trace semantics.
+        """
+
+        final_facts: Dict[str, Any] = {}
+        trace: List[Dict[str, Any]] = []
 
-            trace_entry["evaluated"] = True
-            trace_entry["condition_result"] = result
+        # Memoized results belong to the previous context
+        if self._memo is not None:
+            self._memo.results.clear()
 
-            if result:
-                trace_entry["evaluation_status"] = "EVALUATED_TRUE"
-                
-                # Apply fact (last-write-wins)
-                final_facts.update(output_fact)
-                trace_entry["produced_fact"] = output_fact
-            else:
-                trace_entry["evaluation_status"] = "EVALUATED_FALSE"
+        # Hot-loop bindings: resolve globals and bound methods once per call
+        # (LOAD_FAST instead of a globals/builtins probe per rule)
+        _append = trace.append
+        _copy_template = _TRACE_TEMPLATE.copy
 
         # ---------------------------------------------------------------------
-        # Domain exception handling → trace mapping
+        # Rule evaluation loop
         # ---------------------------------------------------------------------
-        except InvalidRuleDefinition as e:
-            trace_entry.update({
-                "evaluated": True,
-                "evaluation_status": "FAILED_INVALID_DEFINITION",
-                "error": {
-                    "type": "InvalidRuleDefinition",
-                    "message": str(e),
-                },
-            })
-
-        except MissingContextField as e:
-            trace_entry.update({
-                "evaluated": True,
-                "evaluation_status": "FAILED_MISSING_CONTEXT",
-                "error": {
+        for (rule_id, priority, condition, fact_key, fact_value, output_fact,
+             status, error) in self._entries:
+
+            # Base trace entry (filled progressively)
+            trace_entry = _copy_template()
+            trace_entry["rule_id"] = rule_id
+            trace_entry["priority"] = priority
+
+            # -----------------------------------------------------------------
+            # Static outcome (decided at compile time, never evaluated)
+            # -----------------------------------------------------------------
+            if condition is None:
+                trace_entry["evaluation_status"] = status
+                if error is not None:
+                    trace_entry["error"] = error.copy()
+                _append(trace_entry)
+                continue
+
+            # -----------------------------------------------------------------
+            # Evaluate rule condition
+            # -----------------------------------------------------------------
+            try:
+                result = condition(context)
+
+                trace_entry["evaluated"] = True
+                trace_entry["condition_result"] = result
+
+                if result:
+                    trace_entry["evaluation_status"] = "EVALUATED_TRUE"
+                    
+                    # Apply fact (last-write-wins)
+                    final_facts[fact_key] = fact_value
+                    trace_entry["produced_fact"] = output_fact
+                else:
+                    trace_entry["evaluation_status"] = "EVALUATED_FALSE"
+
+            # -----------------------------------------------------------------
+            # Domain exception handling → trace mapping
+            # -----------------------------------------------------------------
+            except MissingContextField as e:
+                trace_entry["evaluated"] = True
+                trace_entry["evaluation_status"] = "FAILED_MISSING_CONTEXT"
+                trace_entry["error"] = {
                     "type": "MissingContextField",
                     "message": str(e),
-                },
-            })
-
-        except RuleEvaluationTypeError as e:
-            trace_entry.update({
-                "evaluated": True,
-                "evaluation_status": "FAILED_TYPE_ERROR",
-                "error": {
+                }
+
+            except RuleEvaluationTypeError as e:
+                trace_entry["evaluated"] = True
+                trace_entry["evaluation_status"] = "FAILED_TYPE_ERROR"
+                trace_entry["error"] = {
                     "type": "RuleEvaluationTypeError",
                     "message": str(e),
-                },
-            })
+                }
 
-        # ---------------------------------------------------------------------
-        # Safety net: Catch unexpected engine failures
-        # ---------------------------------------------------------------------
-        # This should NEVER happen if the engine is correct
-        # But if it does, we fail safely and preserve traceability
-        except Exception as e:
-            trace_entry.update({
-                "evaluated": True,
-                "evaluation_status": "FAILED_ENGINE_ERROR",
-                "error": {
+            # -----------------------------------------------------------------
+            # Safety net: Catch unexpected engine failures
+            # -----------------------------------------------------------------
+            # This should NEVER happen if the engine is correct
+            # But if it does, we fail safely and preserve traceability
+            except Exception as e:
+                trace_entry["evaluated"] = True
+                trace_entry["evaluation_status"] = "FAILED_ENGINE_ERROR"
+                trace_entry["error"] = {
                     "type": type(e).__name__,
                     "message": f"UNEXPECTED ENGINE ERROR (this is a bug): {str(e)}"
-                },
-            })
+                }
+
+            # -----------------------------------------------------------------
+            # Append trace entry (always)
+            # -----------------------------------------------------------------
+            _append(trace_entry)
 
         # ---------------------------------------------------------------------
-        # Append trace entry (always)
+        # Final result
         # ---------------------------------------------------------------------
-        trace.append(trace_entry)
+        return {
+            "facts": final_facts,
+            "trace": trace,
+        }
 
-    # -------------------------------------------------------------------------
-    # Final result
-    # -------------------------------------------------------------------------
-    return {
-        "facts": final_facts,
-        "trace": trace,
+    def evaluate_facts_only(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fast path of evaluate(): returns only the final facts.
+
+        No trace is built. Rules that fail (definition, missing context,
+        type or engine errors) simply produce no fact, exactly as in
+        evaluate(); use evaluate() whenever failures must be explained.
+        """
+
+        final_facts: Dict[str, Any] = {}
+
+        # Memoized results belong to the previous context
+        if self._memo is not None:
+            self._memo.results.clear()
+
+        for condition, fact_key, fact_value in self._fact_entries:
+            try:
+                if condition(context):
+                    # Apply fact (last-write-wins)
+                    final_facts[fact_key] = fact_value
+            except Exception:
+                # Same containment as evaluate(): rule failures never escape
+                continue
+
+        return final_facts
+
+    def evaluate_many(self, contexts: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Evaluates the compiled rules against a batch of contexts.
+
+        Returns:
+        --------
+        list[dict]
+            One evaluate() result per context, in input order.
+        """
+        evaluate = self.evaluate
+        return [evaluate(context) for context in contexts]
+
+
+# =============================================================================
+# Public Rule Engine API
+# =============================================================================
+
+def evaluate_rules(
+    *,
+    context: Dict[str, Any],
+    rules: Union[List[Dict[str, Any]], CompiledRuleSet],
+    memoize: bool = False,
+    trace: bool = True,
+) -> Dict[str, Any]:
+    """
+    Public entry point for the Rule Engine.
+
+    Purpose:
+    --------
+    Evaluates a list of rules against a context snapshot and produces:
+    - a final set of facts
+    - a complete, ordered evaluation trace
+
+    This function:
+    ----------------
+    - Sorts rules deterministically by priority
+    - Respects rule enable/disable flags
+    - Validates rule structure BEFORE evaluation
+    - Compiles conditions via compile_condition, then evaluates them
+    - Catches domain exceptions and converts them into trace entries
+    - NEVER mutates context
+    - NEVER raises rule-level exceptions outward
+
+    It is a thin one-shot wrapper around CompiledRuleSet. Compiling
+    costs more than a single evaluation, so callers that evaluate the
+    same rules against many contexts should pass a CompiledRuleSet
+    (built once, or cached by CachedRulesRepository.get_compiled_rules)
+    instead of the raw list.
+
+    Parameters:
+    -----------
+    rules : list[dict] or CompiledRuleSet
+        Rule definitions, compiled here, or an already compiled set,
+        used as is.
+
+    memoize : bool
+        Share structurally identical 'all'/'any' subtrees across rules and
+        evaluate each at most once (worth it when rules repeat blocks).
+        Ignored for a CompiledRuleSet (fixed when it was built).
+
+    trace : bool
+        Set False when only facts are needed: no trace entries are built
+        and "trace" is None. This deliberately opts out of the
+        every-rule-is-traced invariant; keep the default wherever the
+        result must be explainable.
+
+    Returns:
+    --------
+    {
+        "facts": dict,
+        "trace": list[dict]   (None when trace=False)
     }
+
+    Engine-level failures (invalid rules list structure) may still raise.
+    
+    Trace Status Values:
+    --------------------
+    - SKIPPED_DISABLED: Rule was disabled
+    - EVALUATED_TRUE: Condition evaluated to True, fact produced
+    - EVALUATED_FALSE: Condition evaluated to False
+    - FAILED_INVALID_DEFINITION: Rule structure or condition tree malformed
+    - FAILED_MISSING_CONTEXT: Required field not in context
+    - FAILED_TYPE_ERROR: Type mismatch during comparison
+    - FAILED_ENGINE_ERROR: Unexpected engine failure (should never happen)
+    """
+
+    if isinstance(rules, CompiledRuleSet):
+        rule_set = rules
+    else:
+        rule_set = CompiledRuleSet(rules, memoize=memoize)
+
+    if not trace:
+        return {
+            "facts": rule_set.evaluate_facts_only(context),
+            "trace": None,
+        }
+
+    return rule_set.evaluate(context)
+
+
+def evaluate_rules_batch(
+    *,
+    contexts: Iterable[Dict[str, Any]],
+    rules: List[Dict[str, Any]],
+    memoize: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Batch entry point for the Rule Engine.
+
+    Evaluates the same rules against many context snapshots.
+    Rules are sorted, validated and compiled ONCE for the whole batch.
+
+    Returns:
+    --------
+    list[dict]
+        One {"facts": dict, "trace": list[dict]} result per context,
+        in input order (see evaluate_rules for trace semantics).
+
+    Engine-level failures (invalid rules list structure) may still raise.
+    """
+
+    return CompiledRuleSet(rules, memoize=memoize).evaluate_many(contexts)
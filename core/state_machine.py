@@ -13,11 +13,15 @@ If a transition is not listed here, it does not exist.
 No guard, rule, or API may bypass this definition.
 """
 
+from types import MappingProxyType
+from typing import FrozenSet, Mapping
+
 from core.state import CaseState
 
 
 # Mapping: current_state -> set of allowed next states
-ALLOWED_TRANSITIONS = {
+# (source literal; frozen once into ALLOWED_TRANSITIONS below)
+_ALLOWED_TRANSITIONS = {
     CaseState.CREATED: {
         CaseState.UNDER_REVIEW,
     },
@@ -49,3 +53,13 @@ ALLOWED_TRANSITIONS = {
 
     CaseState.CLOSED: set(),  # Terminal state
 }
+
+# Freeze the constitution: read-only mapping of frozensets, so no caller
+# can add a transition at runtime
+ALLOWED_TRANSITIONS: Mapping[CaseState, FrozenSet[CaseState]] = MappingProxyType({
+    state: frozenset(targets) for state, targets in _ALLOWED_TRANSITIONS.items()
+})
+
+
+# Dense ordinal of each state (declaration order), for table-based lookups
+STATE_INDEX = {state: index for index, state in enumerate(CaseState)}
@@ -23,10 +23,246 @@ This file must NEVER:
 If you violate these rules, the system becomes untrustworthy.
 """
 
-from core.state_machine import ALLOWED_TRANSITIONS
+import json
+import math
+from dataclasses import dataclass
+from datetime import date, datetime, time, timezone
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import orjson
+except ImportError:  # optional accelerator
+    orjson = None
+
+from core.state import CaseState
+from core.state_machine import ALLOWED_TRANSITIONS, STATE_INDEX
 from core.transition_guards import TRANSITION_GUARDS
-from core.guards import evaluate_guards, GuardViolation
-from db.database import transaction
+from core.guards import compile_guards, GuardViolation
+from db.database import (
+    DEFAULT_DB_PATH,
+    get_reader_connection,
+    get_writer_connection,
+    transaction,
+)
+
+
+# -----------------------------------------------------------------------------
+# Audit serialization
+# -----------------------------------------------------------------------------
+
+# Audit metadata column encoder: compact JSON with sorted keys.
+# orjson (optional, C extension) is used when installed, the stdlib
+# encoder otherwise. Both paths store the same document, and neither
+# ever raises on facts that passed the guards (the audit write must
+# not veto a legal transition):
+# - non-JSON values (datetimes, dataclasses, ...) are stored via str();
+#   enums via their value
+# - NaN / +-Infinity are stored as null (bare NaN is not valid JSON)
+# - non-str dict keys are written as orjson's OPT_NON_STR_KEYS writes
+#   them (1 -> "1", True -> "true", enums by value, dates ISO); keys it
+#   cannot write (tuples, ...) via str(). Keys that collide once
+#   spelled (None and NaN are both "null") are one entry on the stdlib
+#   path and repeated on the orjson path.
+# - ints outside the 64-bit range orjson supports are stored via str()
+# Float VALUES may differ in spelling only (1e-05 vs 0.00001).
+
+# Integer range orjson encodes natively (signed min .. unsigned max)
+_INT_MIN, _INT_MAX = -(1 << 63), (1 << 64) - 1
+
+
+def _default(value: Any) -> Any:
+    """Fallback for values JSON cannot represent natively."""
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+_STDLIB_ENCODE = json.JSONEncoder(
+    default=_default,
+    separators=(",", ":"),
+    sort_keys=True,
+    allow_nan=False,
+    ensure_ascii=False,  # orjson writes UTF-8, not \u escapes
+).encode
+
+
+def _encode_facts_stdlib(facts: dict) -> str:
+    """Stdlib encoder, matched to the orjson path's output."""
+    if _needs_normalizing(facts):
+        # Cold path: keys, ints or floats the encoders would treat differently
+        facts = _normalized(facts)
+    return _STDLIB_ENCODE(facts)
+
+
+def _needs_normalizing(value: Any) -> bool:
+    """True if value holds a non-str key, a non-finite float or a big int."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if type(key) is not str or _needs_normalizing(item):
+                return True
+        return False
+    if isinstance(value, (list, tuple)):
+        return any(_needs_normalizing(item) for item in value)
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, int):
+        return not _INT_MIN <= value <= _INT_MAX
+    return False
+
+
+def _normalized(value: Any) -> Any:
+    """
+    Copy of value that both encoders write identically: str keys, null
+    for NaN / +-Infinity, str() for ints outside the 64-bit range.
+    """
+    if isinstance(value, dict):
+        return {
+            key if type(key) is str else _key(key): _normalized(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [_normalized(item) for item in value]
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, int) and not _INT_MIN <= value <= _INT_MAX:
+        return str(value)
+    return value
+
+
+def _key(key: Any) -> str:
+    """A non-str dict key, spelled as orjson's OPT_NON_STR_KEYS spells it."""
+    if key is None or key is True or key is False:
+        return json.dumps(key)
+    if isinstance(key, Enum):
+        return _key(key.value)
+    if isinstance(key, str):
+        return str(key)
+    if isinstance(key, int):
+        return str(int(key))
+    if isinstance(key, float):
+        return _float_key(key)
+    if isinstance(key, (date, time)):
+        return key.isoformat()
+    return str(key)
+
+
+def _float_key(value: float) -> str:
+    """
+    Float spelled as orjson spells it: repr(), except that the exponent
+    has no '+' or leading zeros, and 1e-05 <= |value| < 1e-04 is written
+    in fixed notation.
+    """
+    if not math.isfinite(value):
+        return "null"
+
+    text = repr(value)
+    if "e" not in text:
+        return text
+
+    mantissa, exponent = text.split("e")
+    if int(exponent) == -5:
+        sign = "-" if mantissa.startswith("-") else ""
+        return f"{sign}0.0000{mantissa.lstrip('-').replace('.', '')}"
+    return f"{mantissa}e{int(exponent)}"
+
+
+if orjson is not None:
+
+    # Datetimes and dataclasses go through _default (str), as on the
+    # stdlib path
+    _ORJSON_OPTIONS = (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+    def _encode_facts_orjson(facts: dict) -> str:
+        try:
+            return orjson.dumps(facts, default=_default, option=_ORJSON_OPTIONS).decode()
+        except TypeError:
+            # Cold path: ints beyond 64 bits, or keys orjson cannot write
+            return orjson.dumps(
+                _normalized(facts), default=_default, option=_ORJSON_OPTIONS
+            ).decode()
+
+    _encode_facts = _encode_facts_orjson
+
+else:
+
+    _encode_facts = _encode_facts_stdlib
+
+
+# -----------------------------------------------------------------------------
+# Persistence statements
+# -----------------------------------------------------------------------------
+
+# Shared by every write path. sqlite3 caches prepared statements per
+# connection keyed by SQL text, so one canonical string per statement
+# means each is parsed once per connection.
+# The UPDATE is conditional on the state the transition was validated
+# against: a missing case or a stale from_state matches no row, and the
+# write path rolls back instead of recording a transition that did not
+# happen (see _raise_unapplied).
+_UPDATE_STATE_SQL = """
+    UPDATE cases
+    SET current_state = ?, updated_at = ?
+    WHERE id = ? AND current_state = ?
+"""
+
+_CURRENT_STATE_SQL = "SELECT current_state FROM cases WHERE id = ?"
+
+_INSERT_AUDIT_SQL = """
+    INSERT INTO audit_logs (
+        case_id,
+        from_state,
+        to_state,
+        reason,
+        metadata,
+        created_at
+    )
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+def _utc_timestamp() -> str:
+    """
+    Current UTC time as bound to updated_at / created_at.
+
+    Same layout as SQLite's CURRENT_TIMESTAMP ("YYYY-MM-DD HH:MM:SS") plus
+    microseconds, so values written here sort correctly against rows
+    that were stamped by the column defaults.
+    """
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+# -----------------------------------------------------------------------------
+# State lookup tables
+# -----------------------------------------------------------------------------
+
+# Stored / requested state string -> CaseState
+_STATE_BY_VALUE = {state.value: state for state in CaseState}
+
+# ALLOWED_TRANSITIONS and TRANSITION_GUARDS fused into one table, indexed
+# by state ordinal:
+# _TRANSITION_TABLE[STATE_INDEX[from_state]][STATE_INDEX[to_state]] is
+#   _ILLEGAL                -> the state machine forbids the transition
+#   None                    -> legal, no guards
+#   checker(facts) -> None  -> legal, guards compiled by compile_guards
+# One list lookup answers legality and yields the guard check to call.
+_ILLEGAL = object()
+
+_TRANSITION_TABLE = [[_ILLEGAL] * len(STATE_INDEX) for _ in STATE_INDEX]
+
+for _from, _targets in ALLOWED_TRANSITIONS.items():
+    for _to in _targets:
+        _guards = TRANSITION_GUARDS.get((_from, _to))
+        _TRANSITION_TABLE[STATE_INDEX[_from]][STATE_INDEX[_to]] = (
+            compile_guards(_guards) if _guards else None
+        )
+
+del _from, _targets, _to, _guards
 
 
 # -----------------------------------------------------------------------------
@@ -44,10 +280,100 @@ class IllegalTransition(Exception):
     pass
 
 
+class CaseNotFoundError(Exception):
+    """
+    Raised when a transition names a case that does not exist.
+
+    The message is only formatted if someone actually renders the error
+    (str / logging), not when it is raised and caught.
+    """
+
+    __slots__ = ("case_id",)
+
+    def __init__(self, case_id: str):
+        super().__init__(case_id)
+        self.case_id = case_id
+
+    def __str__(self) -> str:
+        return f"Case not found: {self.case_id}"
+
+
+class NoopTransition(IllegalTransition):
+    """
+    Raised when a transition targets the state the case is already in.
+
+    The state machine has no self-transitions, so this is still an
+    IllegalTransition; the subclass lets idempotent retries recognise
+    "already there" without parsing messages. Raised before any guard
+    evaluation or database work.
+    """
+    pass
+
+
+# -----------------------------------------------------------------------------
+# Bulk transition request
+# -----------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class TransitionRequest:
+    """
+    One transition in a bulk call (see transition_cases).
+
+    Fields mirror transition_case's parameters.
+    """
+    case_id: str
+    from_state: CaseState
+    to_state: CaseState
+    facts: dict
+    reason: str
+
+
 # -----------------------------------------------------------------------------
 # Transition Authority
 # -----------------------------------------------------------------------------
 
+def _check_transition(from_state, to_state, facts: dict) -> None:
+    """
+    Validates one transition WITHOUT touching the database.
+
+    Raises:
+    -------
+    IllegalTransition
+        If the state machine forbids this transition.
+
+    GuardViolation
+        If required guard conditions are not satisfied.
+    """
+
+    # Retried / duplicate request: nothing to do, and nothing is written
+    if from_state is to_state:
+        raise NoopTransition(
+            f"Case is already in state: {to_state.value}"
+        )
+
+    try:
+        checker = _TRANSITION_TABLE[STATE_INDEX[from_state]][STATE_INDEX[to_state]]
+    except KeyError:
+        # Not a CaseState at all
+        checker = _ILLEGAL
+
+    # -------------------------------------------------------------------------
+    # 1. Structural legality check (state machine enforcement)
+    # -------------------------------------------------------------------------
+
+    if checker is _ILLEGAL:
+        raise IllegalTransition(
+            f"Illegal transition: {from_state.value} -> {to_state.value}"
+        )
+
+    # -------------------------------------------------------------------------
+    # 2. Guard validation (facts only, no computation)
+    # -------------------------------------------------------------------------
+
+    if checker is not None:
+        checker(facts)
+
+
 def transition_case(
     *,
     case_id: str,
@@ -90,7 +416,8 @@ def transition_case(
     Raises:
     -------
     IllegalTransition
-        If the state machine forbids this transition.
+        If the state machine forbids this transition
+        (NoopTransition if from_state is to_state).
 
     GuardViolation
         If required guard conditions are not satisfied.
@@ -99,81 +426,217 @@ def transition_case(
     -----------
     - Either BOTH the case state and audit log are written
       OR NEITHER is written.
-    - No partial or silent failures are possible.
+    - No partial or silent failures are possible: if the case does not
+      exist (CaseNotFoundError) or is no longer in from_state
+      (IllegalTransition), nothing is written.
     """
 
     # -------------------------------------------------------------------------
-    # 1. Structural legality check (state machine enforcement)
+    # 1 + 2. Structural legality and guard validation
     # -------------------------------------------------------------------------
 
-    allowed_targets = ALLOWED_TRANSITIONS.get(from_state, set())
-
-    if to_state not in allowed_targets:
-        raise IllegalTransition(
-            f"Illegal transition: {from_state.value} -> {to_state.value}"
-        )
-
-    # -------------------------------------------------------------------------
-    # 2. Guard validation (facts only, no computation)
-    # -------------------------------------------------------------------------
-
-    guard_key = (from_state, to_state)
-    required_guards = TRANSITION_GUARDS.get(guard_key)
-
-    if required_guards:
-        evaluate_guards(required_guards, facts)
+    _check_transition(from_state, to_state, facts)
 
     # -------------------------------------------------------------------------
     # 3. Atomic persistence (state + audit log)
     # -------------------------------------------------------------------------
 
+    # Both parameter tuples (including the facts JSON) are built BEFORE
+    # BEGIN, so the write transaction only spans the two statements.
+    # One timestamp stamps both rows.
+    now = _utc_timestamp()
+    state_params = (to_state.value, now, case_id, from_state.value)
+    audit_params = (
+        case_id,
+        from_state.value,
+        to_state.value,
+        reason,
+        _encode_facts(facts),
+        now,
+    )
+
     # The transaction context manager guarantees:
     # - BEGIN before block
     # - COMMIT on success
     # - ROLLBACK on ANY exception
     with transaction(db_conn) as tx:
 
-        # Update the authoritative current state
-        tx.execute(
-            """
-            UPDATE cases
-            SET current_state = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-            """,
-            (to_state.value, case_id),
-        )
+        # Update the authoritative current state (only if it still
+        # is from_state)
+        if tx.execute(_UPDATE_STATE_SQL, state_params).rowcount != 1:
+            _raise_unapplied(tx, case_id, from_state)
 
         # Record the transition permanently
-        tx.execute(
-            """
-            INSERT INTO audit_logs (
-                case_id,
-                from_state,
-                to_state,
-                reason,
-                metadata
+        _write_audit(tx, audit_params)
+
+
+def _raise_unapplied(tx, case_id: str, from_state) -> None:
+    """
+    Explains why a conditional state UPDATE matched no row (cold path).
+
+    Raises:
+    -------
+    CaseNotFoundError
+        If the case does not exist.
+
+    IllegalTransition
+        If the case exists but is no longer in from_state (the caller's
+        view of the case is stale).
+    """
+
+    row = tx.execute(_CURRENT_STATE_SQL, (case_id,)).fetchone()
+
+    if row is None:
+        raise CaseNotFoundError(case_id)
+
+    raise IllegalTransition(
+        f"Case {case_id} is in state {row[0]!r}, not {from_state.value!r}"
+    )
+
+
+def _write_audit(tx, audit_params: tuple) -> None:
+    """
+    Appends one audit row inside the caller's open transaction.
+
+    Kept separate so a failing audit write (which must roll back the
+    state update with it) can be simulated without breaking the schema.
+    """
+    tx.execute(_INSERT_AUDIT_SQL, audit_params)
+
+
+def transition_cases(items: Iterable[TransitionRequest], db_conn) -> None:
+    """
+    Transitions many cases in ONE transaction.
+
+    Bulk counterpart of transition_case: same checks, same rows written,
+    but one BEGIN/COMMIT (and one fsync) for the whole batch.
+
+    No-op items (from_state is to_state, e.g. retried requests) are
+    dropped up front: they are neither validated nor written, and they
+    do not abort the rest of the batch. (transition_case raises
+    NoopTransition for the same input.)
+
+    Parameters:
+    -----------
+    items : Iterable[TransitionRequest]
+        One request per case. A case may appear at most once.
+        Any iterable is accepted (it is read exactly once).
+
+    db_conn : sqlite3.Connection
+        Active database connection.
+
+    Raises:
+    -------
+    IllegalTransition
+        If ANY transition is forbidden, or a case appears twice.
+
+    GuardViolation
+        If ANY transition's guards are not satisfied.
+
+    Guarantees:
+    -----------
+    - Every item is validated BEFORE anything is written.
+    - Either ALL state updates and audit logs are written
+      OR NONE are (one failure rejects the whole batch), including when
+      a case is missing or no longer in its item's from_state.
+    """
+
+    # Validation, the streaming writes and the rowcount check each walk
+    # the batch: materialize it once so a one-shot iterator is not used
+    # up by validation (which would commit an empty write as success).
+    # No-ops are partitioned out in the same pass.
+    items = [item for item in items if item.from_state is not item.to_state]
+
+    if not items:
+        return
+
+    # -------------------------------------------------------------------------
+    # 1 + 2. Validate the whole batch up-front
+    # -------------------------------------------------------------------------
+
+    seen = set()
+
+    for item in items:
+        # Each item's from_state must be the case's real state; a second
+        # item for the same case would be checked against a stale state
+        if item.case_id in seen:
+            raise IllegalTransition(
+                f"Case {item.case_id} appears more than once in the batch"
             )
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (
-                case_id,
-                from_state.value,
-                to_state.value,
-                reason,
-                str(facts),  # JSON serialization comes later
-            ),
+        seen.add(item.case_id)
+
+        _check_transition(item.from_state, item.to_state, item.facts)
+
+    # -------------------------------------------------------------------------
+    # 3. Atomic persistence (all states + all audit logs)
+    # -------------------------------------------------------------------------
+
+    # Rows are streamed to executemany from generators rather than built
+    # as lists first, so only one row (and one encoded facts payload) is
+    # alive at a time, however large the batch.
+    now = _utc_timestamp()
+    state_rows = (
+        (item.to_state.value, now, item.case_id, item.from_state.value)
+        for item in items
+    )
+    audit_rows = (
+        (
+            item.case_id,
+            item.from_state.value,
+            item.to_state.value,
+            item.reason,
+            _encode_facts(item.facts),
+            now,
         )
+        for item in items
+    )
+
+    with transaction(db_conn) as tx:
+        # rowcount sums over the batch: every item must update its row
+        if tx.executemany(_UPDATE_STATE_SQL, state_rows).rowcount != len(items):
+            _raise_unapplied_batch(tx, items)
+
+        tx.executemany(_INSERT_AUDIT_SQL, audit_rows)
+
+
+def _raise_unapplied_batch(tx, items) -> None:
+    """
+    Names an item whose conditional UPDATE matched no row (cold path).
+
+    Items that were applied now hold their to_state; the first item
+    holding anything else is missing or stale.
+    """
+
+    for item in items:
+        row = tx.execute(_CURRENT_STATE_SQL, (item.case_id,)).fetchone()
+
+        if row is None:
+            raise CaseNotFoundError(item.case_id)
+
+        if row[0] != item.to_state.value:
+            _raise_unapplied(tx, item.case_id, item.from_state)
+
+    # A stale item whose case already sits in its to_state
+    raise IllegalTransition(
+        "Batch contains a case that is no longer in its from_state"
+    )
+
+
 def execute_transition(
     *,
     case_id: str,
     action: str,
     facts: dict,
+    db_path: str = DEFAULT_DB_PATH,
+    from_state_value: Optional[str] = None,
 ) -> dict:
     """
     Public Transition Engine entry point.
 
     This function:
-    - Loads current state internally
+    - Loads current state internally (from the database at db_path,
+      through the cached read-only connection for that path), unless the caller
+      already holds it and passes it as from_state_value
     - Maps 'action' → target state
     - Delegates to transition_case
     - Returns a structured result for orchestrators
@@ -182,29 +645,11 @@ def execute_transition(
     """
 
     # ---------------------------------------------------------------------
-    # 1. Load current state (internal concern)
+    # 1. Load current state (internal concern, read-only connection)
     # ---------------------------------------------------------------------
-    # NOTE: This assumes a DB accessor exists.
-    # If not yet implemented, stub it for now.
-    from db.database import get_connection
-
-    db_conn = get_connection()
-
-    cursor = db_conn.execute(
-        "SELECT current_state FROM cases WHERE id = ?",
-        (case_id,)
+    from_state, to_state = _resolve_states(
+        db_path, case_id, action, from_state_value
     )
-    row = cursor.fetchone()
-
-    if not row:
-        raise Exception(f"Case not found: {case_id}")
-
-    from_state_value = row[0]
-
-    # Convert string → CaseState enum
-    from core.state import CaseState
-    from_state = CaseState(from_state_value)
-    to_state = CaseState(action)
 
     # ---------------------------------------------------------------------
     # 2. Delegate to core transition authority
@@ -215,12 +660,118 @@ def execute_transition(
         to_state=to_state,
         facts=facts,
         reason=f"Orchestrated transition to {action}",
-        db_conn=db_conn,
+        db_conn=get_writer_connection(db_path),
     )
 
     # ---------------------------------------------------------------------
     # 3. Return structured result
     # ---------------------------------------------------------------------
+    return _transition_result(case_id, action, from_state, to_state)
+
+
+def execute_transitions(
+    *,
+    requests: List[Dict[str, Any]],
+    db_path: str = DEFAULT_DB_PATH,
+) -> List[dict]:
+    """
+    Bulk Transition Engine entry point.
+
+    Like execute_transition, for many cases at once: each request is a
+    dict with 'case_id', 'action' and 'facts'. All transitions are
+    validated first and written in ONE transaction (all or nothing).
+
+    Returns:
+    --------
+    list[dict]
+        One execute_transition-style result per request, in order.
+        A request for the state the case is already in is skipped and
+        reported with status "NOOP" and no audit entry.
+    """
+
+    items = []
+    results = []
+
+    for request in requests:
+        case_id = request["case_id"]
+        action = request["action"]
+
+        from_state, to_state = _resolve_states(db_path, case_id, action)
+
+        items.append(TransitionRequest(
+            case_id=case_id,
+            from_state=from_state,
+            to_state=to_state,
+            facts=request["facts"],
+            reason=f"Orchestrated transition to {action}",
+        ))
+        results.append(
+            _noop_result(to_state) if from_state is to_state
+            else _transition_result(case_id, action, from_state, to_state)
+        )
+
+    transition_cases(items, get_writer_connection(db_path))
+
+    return results
+
+
+def _resolve_states(
+    db_path: str,
+    case_id: str,
+    action: str,
+    from_state_value: Optional[str] = None,
+):
+    """
+    Loads a case's current state and maps 'action' to the target state.
+
+    The SELECT runs on the read-only connection for db_path, so it never
+    waits on the writer. When from_state_value is given (the caller
+    already loaded the case), the SELECT is skipped; the conditional
+    UPDATE in transition_case still rejects a missing case or a stale
+    from_state_value.
+
+    Returns:
+    --------
+    (from_state, to_state) : (CaseState, CaseState)
+    """
+
+    if from_state_value is None:
+        cursor = get_reader_connection(db_path).execute(
+            _CURRENT_STATE_SQL,
+            (case_id,)
+        )
+        row = cursor.fetchone()
+
+        if not row:
+            raise CaseNotFoundError(case_id)
+
+        from_state_value = row[0]
+
+    # Convert string → CaseState enum (plain dict lookups, no Enum __call__)
+    from_state = _STATE_BY_VALUE.get(from_state_value)
+    if from_state is None:
+        raise IllegalTransition(
+            f"Case {case_id} is in unknown state: {from_state_value!r}"
+        )
+
+    to_state = _STATE_BY_VALUE.get(action)
+    if to_state is None:
+        raise IllegalTransition(f"Unknown target state: {action!r}")
+
+    return from_state, to_state
+
+
+def _noop_result(state) -> dict:
+    """Result for a skipped no-op request (nothing written, no audit)."""
+    return {
+        "new_state": state.value,
+        "status": "NOOP",
+        "audit_entry": None,
+    }
+
+
+def _transition_result(case_id: str, action: str, from_state, to_state) -> dict:
+    """Structured result returned to orchestrators."""
     return {
         "new_state": to_state.value,
         "status": "SUCCESS",
@@ -20,12 +20,16 @@ If a transition is not listed here:
 - It only needs to be structurally legal
 """
 
+from types import MappingProxyType
+from typing import Any, Mapping, Tuple
+
 from core.state import CaseState
 
 
 # Mapping:
 # (from_state, to_state) -> { fact_name: expected_value }
-TRANSITION_GUARDS = {
+# (source literal; frozen once into TRANSITION_GUARDS below)
+_TRANSITION_GUARDS = {
 
     # Case can move to review only if required data is present
     (CaseState.CREATED, CaseState.UNDER_REVIEW): {
@@ -72,3 +76,9 @@ TRANSITION_GUARDS = {
         "additional_info_provided": True,
     },
 }
+
+# Freeze the policy table (read-only at every level)
+TRANSITION_GUARDS: Mapping[Tuple[CaseState, CaseState], Mapping[str, Any]] = MappingProxyType({
+    transition: MappingProxyType(guards)
+    for transition, guards in _TRANSITION_GUARDS.items()
+})
@@ -38,10 +38,11 @@ Critical Rule:
 If this module starts "deciding" anything, Phase 3 has failed.
 """
 
-from typing import Dict, Any
+from datetime import date
+from typing import Dict, Any, List
 
-from core.rule_engine import evaluate_rules
-from core.transition_engine import execute_transition
+from core.rule_engine import CompiledRuleSet, evaluate_rules
+from core.transition_engine import execute_transition, execute_transitions
 from repositories.protocols import CaseRepository, RulesRepository
 from builders.context_builder import ContextBuilder
 
@@ -128,9 +129,10 @@ def run_workflow_step(
     # -------------------------------------------------------------------------
     # Step 3: Evaluate rules
     # -------------------------------------------------------------------------
-    # Load rules for this case type
+    # Load rules for this case type (compiled; reused when the
+    # repository caches them)
     # Assumption: case.case_type exists (documented, will fail if not)
-    rules = rules_repository.get_active_rules(case.case_type)
+    rules = _compiled_rules(rules_repository, case.case_type)
     
     # Invoke Rule Engine (Phase 2 - pure function)
     rule_result = evaluate_rules(
@@ -148,10 +150,13 @@ def run_workflow_step(
     # Pass facts to Transition Engine UNCHANGED
     # No filtering, no merging, no "helping"
     # Guards decide if facts are sufficient
+    # The case was already loaded in Step 1; hand its state over so the
+    # engine does not SELECT it again.
     transition_result = execute_transition(
         case_id=case_id,
         action=target_state,
-        facts=facts  # ← Semantic hygiene: facts, not context
+        facts=facts,  # ← Semantic hygiene: facts, not context
+        from_state_value=case.current_state
     )
     
     # -------------------------------------------------------------------------
@@ -169,3 +174,130 @@ def run_workflow_step(
     }
 
 
+def run_workflow_steps(
+    *,
+    steps: List[Dict[str, str]],
+    case_repository: CaseRepository,
+    rules_repository: RulesRepository
+) -> List[Dict[str, Any]]:
+    """
+    Batch counterpart of run_workflow_step.
+
+    Steps 1-3 (fetch, build context, evaluate rules) run per case exactly
+    as in run_workflow_step, except that each case type's rules are
+    loaded and compiled once per batch. Step 4 is delegated to the bulk Transition
+    Engine entry point, so all transitions commit in ONE transaction
+    (all or nothing).
+
+    Parameters:
+    -----------
+    steps : list[dict]
+        Each item is {"case_id": str, "target_state": str}
+
+    case_repository : CaseRepository
+        Abstraction for case data access
+
+    rules_repository : RulesRepository
+        Abstraction for rules data access
+
+    Returns:
+    --------
+    list[dict]
+        One run_workflow_step-shaped result per step, in order.
+
+    Raises:
+    -------
+    Same as run_workflow_step. A failing transition aborts the whole
+    batch; no case is transitioned.
+    """
+
+    evaluations = []
+    requests = []
+
+    # case_type -> compiled rules, shared by every case of that type
+    rule_sets: Dict[str, CompiledRuleSet] = {}
+
+    # One clock reading for the whole batch, so derived fields such as
+    # days_open are measured against the same day for every case
+    today = date.today()
+
+    # -------------------------------------------------------------------------
+    # Steps 1-3: Fetch, build context, evaluate rules (per case)
+    # -------------------------------------------------------------------------
+    for step in steps:
+        case = case_repository.get_case(step["case_id"])
+        context = ContextBuilder.build(case, today=today)
+
+        rules = rule_sets.get(case.case_type)
+        if rules is None:
+            rules = rule_sets[case.case_type] = _compiled_rules(
+                rules_repository, case.case_type
+            )
+
+        rule_result = evaluate_rules(
+            context=context,
+            rules=rules
+        )
+
+        evaluations.append(rule_result)
+        requests.append({
+            "case_id": step["case_id"],
+            "action": step["target_state"],
+            "facts": rule_result["facts"],  # ← passed UNCHANGED
+        })
+
+    # -------------------------------------------------------------------------
+    # Step 4: Execute all transitions in one write transaction
+    # -------------------------------------------------------------------------
+    transition_results = execute_transitions(requests=requests)
+
+    # -------------------------------------------------------------------------
+    # Step 5: Return complete traces
+    # -------------------------------------------------------------------------
+    return [
+        {
+            "case_id": request["case_id"],
+            "from_state": _transitioned_from(transition_result),
+            "to_state": transition_result["new_state"],
+            "facts": rule_result["facts"],
+            "rule_trace": rule_result["trace"],
+            "transition_status": transition_result["status"],
+            "audit_entry": transition_result.get("audit_entry")
+        }
+        for rule_result, request, transition_result
+        in zip(evaluations, requests, transition_results)
+    ]
+
+
+def _compiled_rules(
+    rules_repository: RulesRepository,
+    case_type: str,
+) -> CompiledRuleSet:
+    """
+    Active rules for case_type, compiled.
+
+    Repositories that cache compiled rules (CachedRulesRepository)
+    provide get_compiled_rules; for any other RulesRepository the rules
+    are compiled here.
+    """
+    get_compiled_rules = getattr(rules_repository, "get_compiled_rules", None)
+    if get_compiled_rules is not None:
+        return get_compiled_rules(case_type)
+    return CompiledRuleSet(rules_repository.get_active_rules(case_type))
+
+
+def _transitioned_from(transition_result: Dict[str, Any]) -> str:
+    """
+    State the engine actually moved the case out of.
+
+    The bulk engine looks each case's state up again (on the read-only
+    connection, before and outside its write transaction), so this may
+    differ from the state fetched in Step 1. It is a report only: what
+    guarantees the transition applied to this state is the engine's
+    conditional UPDATE, not this lookup. A NOOP leaves the case where
+    it was.
+    """
+    audit_entry = transition_result.get("audit_entry")
+    if audit_entry is None:
+        return transition_result["new_state"]
+    return audit_entry["from_state"]
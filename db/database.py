@@ -17,47 +17,229 @@ This module is intentionally simple.
 If it becomes complex, something above is leaking responsibility.
 """
 
+import atexit
 import sqlite3
+import threading
 from contextlib import contextmanager
-from typing import Generator
+from pathlib import Path
+from typing import Any, Callable, Dict, Generator, Optional, Tuple
+
+
+# Database used when a caller does not name one explicitly
+DEFAULT_DB_PATH = "workflow.db"
+
+# Connection tuning applied once, when a connection is opened
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",       # readers do not block the writer
+    "PRAGMA synchronous=NORMAL",     # no fsync per COMMIT (safe under WAL)
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",    # read pages via a 256 MB memory map
+    "PRAGMA cache_size=-64000",      # ~64 MB page cache
+    "PRAGMA busy_timeout=30000",     # retry on SQLITE_BUSY for up to 30s
+)
+
+# Prepared statements kept per connection (sqlite3 default: 128), so the
+# fixed set of hot-path statements is never evicted and re-parsed
+_CACHED_STATEMENTS = 256
+
+# Read-only connections cannot change the journal mode or durability
+# settings (both belong to the writer); they get the rest
+_READER_PRAGMAS = tuple(
+    pragma for pragma in _PRAGMAS
+    if "journal_mode" not in pragma and "synchronous" not in pragma
+)
+
+# Per-thread connection cache: (db_path, row_factory, read_only) -> connection
+# (sqlite3 connections must not be shared across threads by default)
+_local = threading.local()
 
 
 # -----------------------------------------------------------------------------
 # Database Connection
 # -----------------------------------------------------------------------------
 
-def get_connection(db_path: str) -> sqlite3.Connection:
+def get_connection(
+    db_path: str,
+    row_factory: Optional[Callable[[sqlite3.Cursor, tuple], Any]] = None,
+) -> sqlite3.Connection:
     """
-    Creates and returns a SQLite database connection.
+    Returns a SQLite database connection, reused across calls.
+
+    The first call for a db_path (per thread) opens and configures the
+    connection; later calls return the same handle, so hot paths do
+    not pay the open + configure cost per operation.
 
     Parameters:
     -----------
     db_path : str
         Path to the SQLite database file.
         Use ':memory:' for in-memory databases (testing).
+        In-memory connections are NEVER cached: each call
+        returns a fresh, empty database.
+
+    row_factory : callable, optional
+        Row factory for the connection, e.g. sqlite3.Row for
+        name-based column access. Default None returns plain tuples,
+        which are cheaper to build; pass sqlite3.Row only from code
+        that reads columns by name. Each (db_path, row_factory) pair
+        gets its own cached connection.
 
     Returns:
     --------
     sqlite3.Connection
-        A live database connection.
+        A live database connection. It is SHARED with every other
+        caller on this thread: do not close it (use close_connections()).
+        A cached connection found closed is replaced by a fresh one.
 
     Important Configuration:
     ------------------------
-    - row_factory enables name-based column access
+    - row_factory only when requested (tuples by default)
     - isolation_level=None enables manual transaction control
+    - WAL journal + synchronous=NORMAL (see _PRAGMAS)
+    """
+
+    if db_path == ":memory:":
+        return _open_connection(db_path, row_factory)
+
+    return _cached_connection(db_path, row_factory, read_only=False)
+
+
+def get_writer_connection(
+    db_path: str,
+    row_factory: Optional[Callable[[sqlite3.Cursor, tuple], Any]] = None,
+) -> sqlite3.Connection:
+    """
+    Returns the read-write connection for db_path (per thread).
+
+    Same connection as get_connection; the name documents intent at call
+    sites that pair it with get_reader_connection.
+    """
+
+    return get_connection(db_path, row_factory)
+
+
+def get_reader_connection(
+    db_path: str,
+    row_factory: Optional[Callable[[sqlite3.Cursor, tuple], Any]] = None,
+) -> sqlite3.Connection:
+    """
+    Returns a READ-ONLY connection for db_path, reused across calls.
+
+    SQLite serializes writers, but under WAL readers never wait for them.
+    Keeping lookups on their own read-only connection means they are
+    never queued behind (or mistaken for part of) the writer's
+    transaction.
+
+    Parameters:
+    -----------
+    db_path : str
+        Path to an EXISTING SQLite database file, opened with mode=ro.
+        ':memory:' has nothing to share across connections, so it falls
+        back to get_connection.
+
+    row_factory : callable, optional
+        As for get_connection.
+
+    Returns:
+    --------
+    sqlite3.Connection
+        A read-only connection; any write raises sqlite3.OperationalError.
+        Shared like get_connection's: do not close it.
+    """
+
+    if db_path == ":memory:":
+        return get_connection(db_path, row_factory)
+
+    return _cached_connection(db_path, row_factory, read_only=True)
+
+
+def close_connections() -> None:
+    """
+    Closes every connection cached for the calling thread.
+
+    Registered with atexit for the main thread.
+    """
+
+    connections = _thread_connections()
+
+    while connections:
+        _, conn = connections.popitem()
+        conn.close()
+
+
+def _cached_connection(db_path: str, row_factory, read_only: bool) -> sqlite3.Connection:
+    """
+    Returns the calling thread's cached connection for the key, opening
+    it on first use.
+
+    A caller that closed the shared handle anyway would otherwise break
+    every later call on this thread, so a closed connection is dropped
+    and reopened.
     """
 
-    conn = sqlite3.connect(
-        db_path,
-        detect_types=sqlite3.PARSE_DECLTYPES,
-    )
+    connections = _thread_connections()
+    key = (db_path, row_factory, read_only)
 
-    # Enables dict-like row access (row["current_state"])
-    conn.row_factory = sqlite3.Row
+    conn = connections.get(key)
+    if conn is not None:
+        try:
+            conn.total_changes  # raises on a closed connection
+        except sqlite3.ProgrammingError:
+            conn = None
+
+    if conn is None:
+        conn = connections[key] = _open_connection(
+            db_path, row_factory, read_only=read_only
+        )
+
+    return conn
+
+
+def _thread_connections() -> Dict[Tuple[str, Any, bool], sqlite3.Connection]:
+    """Returns the calling thread's connection cache."""
+    try:
+        return _local.connections
+    except AttributeError:
+        _local.connections = {}
+        return _local.connections
+
+
+def _open_connection(
+    db_path: str,
+    row_factory=None,
+    read_only: bool = False,
+) -> sqlite3.Connection:
+    """Opens and configures a new connection."""
+
+    if read_only:
+        conn = sqlite3.connect(
+            Path(db_path).resolve().as_uri() + "?mode=ro",
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            cached_statements=_CACHED_STATEMENTS,
+            uri=True,
+        )
+        pragmas = _READER_PRAGMAS
+    else:
+        conn = sqlite3.connect(
+            db_path,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            cached_statements=_CACHED_STATEMENTS,
+        )
+        pragmas = _PRAGMAS
+
+    # sqlite3.Row enables dict-like row access (row["current_state"]);
+    # None keeps the default (and faster) tuple rows
+    conn.row_factory = row_factory
+
+    for pragma in pragmas:
+        conn.execute(pragma)
 
     return conn
 
 
+atexit.register(close_connections)
+
+
 # -----------------------------------------------------------------------------
 # Transaction Management
 # -----------------------------------------------------------------------------
@@ -87,12 +269,18 @@ def transaction(conn: sqlite3.Connection) -> Generator[sqlite3.Connection, None,
     This context manager gives us:
     - explicit transaction boundaries
     - predictable rollback behavior
+
+    BEGIN stays an explicit statement so the boundary holds whatever the
+    connection's isolation_level is. COMMIT / ROLLBACK go through
+    conn.commit() / conn.rollback() rather than execute(), so the
+    sqlite3 module's own transaction bookkeeping (in_transaction)
+    stays consistent with the connection's real state.
     """
 
     try:
         conn.execute("BEGIN")
         yield conn
-        conn.execute("COMMIT")
+        conn.commit()
     except Exception:
-        conn.execute("ROLLBACK")
+        conn.rollback()
         raise
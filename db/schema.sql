@@ -93,7 +93,15 @@ CREATE TABLE IF NOT EXISTS cases (
     - Only update when current_state changes.
     */
     updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
-);
+)
+/*
+WITHOUT ROWID:
+--------------
+Every access to this table is a single-row lookup by id (SELECT / UPDATE
+in the transition engine). Storing rows directly in the primary-key
+B-tree means one B-tree descent per access instead of two.
+*/
+WITHOUT ROWID;
 
 
 /*
@@ -115,8 +123,15 @@ If audit_logs is missing or corrupted:
 */
 
 CREATE TABLE IF NOT EXISTS audit_logs (
-    -- Surrogate key for ordering and indexing.
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    /*
+    Surrogate key for ordering and indexing.
+
+    Plain INTEGER PRIMARY KEY (rowid alias), not AUTOINCREMENT:
+    AUTOINCREMENT only differs by never reusing the ids of deleted rows,
+    and costs an extra sqlite_sequence write on every insert. Rows here
+    are never deleted (append-only), so ids stay strictly increasing.
+    */
+    id INTEGER PRIMARY KEY,
 
     -- Foreign key back to the case.
     -- Logical relationship; enforcement is done at the application layer.
@@ -178,9 +193,10 @@ They reflect real query patterns:
 - audits
 */
 
--- Fast retrieval of a case's full transition history
-CREATE INDEX IF NOT EXISTS idx_audit_logs_case_id
-ON audit_logs (case_id);
+-- Fast retrieval of a case's full transition history, already in
+-- chronological order (also serves plain case_id lookups)
+CREATE INDEX IF NOT EXISTS idx_audit_logs_case_id_created_at
+ON audit_logs (case_id, created_at);
 
 -- Fast ordering of transitions over time
 CREATE INDEX IF NOT EXISTS idx_audit_logs_created_at
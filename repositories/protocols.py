@@ -19,10 +19,14 @@ from typing import Protocol, Dict, Any, List
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Case:
     """
     Domain model for a Case.
+
+    Immutable snapshot of a case as loaded by a repository. Slotted:
+    no per-instance __dict__, which matters when batches of cases are
+    held in memory (run_workflow_steps).
     
     Attributes:
     -----------
@@ -0,0 +1,122 @@
+# =============================================================================
+# File: repositories/rules_cache.py
+# Purpose: Versioned in-memory cache in front of a RulesRepository
+# =============================================================================
+
+"""
+Rules Cache
+
+Purpose:
+--------
+Rules change rarely, but run_workflow_step asks for them on every step.
+CachedRulesRepository wraps any RulesRepository and keeps each case
+type's rules in memory until they are invalidated.
+
+It is itself a RulesRepository, so orchestrators take it unchanged.
+It also keeps each case type's rules COMPILED (get_compiled_rules), so
+the Rule Engine's compile step is paid once per rules version rather
+than once per case.
+
+Invalidation:
+-------------
+- invalidate(case_type) / invalidate() : called by writers after a
+  rules change
+- version_probe(case_type) : optional; a cheap "has anything changed?"
+  query (e.g. SELECT MAX(updated_at) FROM rules WHERE case_type = ?).
+  When its result differs from the one cached with the rules, the
+  rules are reloaded.
+
+It does NOT:
+------------
+- Filter, validate or transform rules (beyond ordering them)
+- Decide which rules apply
+"""
+
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from core.rule_engine import CompiledRuleSet
+from repositories.protocols import RulesRepository
+
+
+class CachedRulesRepository:
+    """
+    RulesRepository decorator that memoizes get_active_rules per case type.
+
+    Parameters:
+    -----------
+    inner : RulesRepository
+        Source of truth, consulted on a cache miss.
+
+    version_probe : Callable[[str], Hashable], optional
+        Returns the current rules version for a case type. Called on every
+        lookup; a changed value forces a reload.
+
+    Notes:
+    ------
+    - Cached rule lists are pre-sorted by priority (stable, same key as
+      the Rule Engine), so the engine's own sort finds them in order.
+    - The returned list is shared between callers: treat it as read-only.
+    - Compiled sets are built without memoize, so they hold no
+      per-evaluation state and are safe to share.
+    """
+
+    def __init__(
+        self,
+        inner: RulesRepository,
+        version_probe: Optional[Callable[[str], Hashable]] = None,
+    ):
+        self._inner = inner
+        self._version_probe = version_probe
+
+        # case_type -> (probed version, rules)
+        self._entries: Dict[str, Tuple[Any, List[Dict[str, Any]]]] = {}
+
+        # case_type -> rules of the current entry, compiled on first use
+        self._compiled: Dict[str, CompiledRuleSet] = {}
+
+    def get_active_rules(self, case_type: str) -> List[Dict[str, Any]]:
+        """
+        Returns the active rules for case_type, loading them only on a miss.
+        """
+
+        probe = self._version_probe
+        version = probe(case_type) if probe is not None else None
+
+        entry = self._entries.get(case_type)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        rules = sorted(
+            self._inner.get_active_rules(case_type),
+            key=lambda r: r.get("priority", 0),
+        )
+        self._entries[case_type] = (version, rules)
+        self._compiled.pop(case_type, None)
+
+        return rules
+
+    def get_compiled_rules(self, case_type: str) -> CompiledRuleSet:
+        """
+        Returns the active rules for case_type as a CompiledRuleSet,
+        compiling them only when they were (re)loaded.
+        """
+
+        rules = self.get_active_rules(case_type)
+
+        compiled = self._compiled.get(case_type)
+        if compiled is None:
+            compiled = self._compiled[case_type] = CompiledRuleSet(rules)
+
+        return compiled
+
+    def invalidate(self, case_type: Optional[str] = None) -> None:
+        """
+        Drops cached rules for case_type, or for every case type if None.
+        """
+
+        if case_type is None:
+            self._entries.clear()
+            self._compiled.clear()
+        else:
+            self._entries.pop(case_type, None)
+            self._compiled.pop(case_type, None)
@@ -19,9 +19,66 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from tests.helpers import FixtureConnection  # noqa: E402  (needs PROJECT_ROOT)
+
+
+@pytest.fixture(scope="session")
+def mock_factory():
+    """
+    unittest.mock.Mock, imported on first use.
+
+    Only the tests that need mocks pay for importing unittest.mock;
+    collecting the rest of the suite does not.
+    """
+
+    from unittest.mock import Mock
+
+    return Mock
+
+
+_SCHEMA_DDL = """
+    CREATE TABLE cases (
+        id TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        current_state TEXT NOT NULL,
+        data TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    ) WITHOUT ROWID;
+
+    CREATE TABLE audit_logs (
+        id INTEGER PRIMARY KEY,
+        case_id TEXT NOT NULL,
+        from_state TEXT NOT NULL,
+        to_state TEXT NOT NULL,
+        reason TEXT NOT NULL,
+        metadata TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE INDEX idx_audit_logs_case_id_created_at
+    ON audit_logs (case_id, created_at);
+"""
+
+
+@pytest.fixture(scope="session")
+def schema_db():
+    """
+    An empty, fully-migrated in-memory database, built ONCE per session.
+
+    db_conn copies it instead of re-running the schema DDL per test.
+    """
+
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(_SCHEMA_DDL)
+
+    yield conn
+
+    conn.close()
+
 
 @pytest.fixture
-def db_conn():
+def db_conn(schema_db):
     """
     Provides a fresh in-memory SQLite database for each test.
 
@@ -30,34 +87,28 @@ def db_conn():
     - Fast
     - Isolated
     - Deterministic
+
+    Why a copy of schema_db?
+    ------------------------
+    Connection.backup copies the already-built schema pages, which is
+    cheaper than parsing and executing the DDL again. Each test still
+    owns a private database, so the code under test keeps full control
+    of its transactions (BEGIN / COMMIT / ROLLBACK, even DROP TABLE);
+    a shared database rolled back per test via SAVEPOINT could not
+    allow that.
     """
 
-    conn = sqlite3.connect(":memory:")
+    conn = sqlite3.connect(":memory:", factory=FixtureConnection)
+    schema_db.backup(conn)
     conn.row_factory = sqlite3.Row
+    conn.helper_cursor = conn.cursor()  # shared by tests.helpers
 
-    # Load schema
-    conn.executescript(
-        """
-        CREATE TABLE cases (
-            id TEXT PRIMARY KEY,
-            title TEXT NOT NULL,
-            current_state TEXT NOT NULL,
-            data TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-
-        CREATE TABLE audit_logs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            case_id TEXT NOT NULL,
-            from_state TEXT NOT NULL,
-            to_state TEXT NOT NULL,
-            reason TEXT NOT NULL,
-            metadata TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-        """
-    )
+    # Same tuning as db.database.get_connection
+    # (journal_mode=WAL does not apply to in-memory databases)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")
+    conn.execute("PRAGMA busy_timeout=30000")
 
     yield conn
 
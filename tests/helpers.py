@@ -6,13 +6,47 @@ Utility helpers for setting up test data.
 These helpers:
 ---------------
 - Insert minimal valid rows
+- Read back state / audit rows for assertions
 - Do NOT perform transitions
 - Do NOT contain logic
 """
 
+import sqlite3
+
 from core.state import CaseState
 
 
+# Statement text shared by every call, so sqlite3's per-connection
+# statement cache finds each one already prepared
+_INSERT_CASE_SQL = """
+    INSERT INTO cases (id, title, current_state, data)
+    VALUES (?, ?, ?, ?)
+"""
+
+_INSERT_CASE_RETURNING_SQL = _INSERT_CASE_SQL + "RETURNING current_state"
+
+_CURRENT_STATE_SQL = "SELECT current_state FROM cases WHERE id = ?"
+
+_AUDIT_ROWS_SQL = """
+    SELECT from_state, to_state, reason, metadata
+    FROM audit_logs
+    WHERE case_id = ?
+    ORDER BY id
+"""
+
+
+class FixtureConnection(sqlite3.Connection):
+    """
+    Connection opened by the db_conn fixture.
+
+    Carries the fixture's reusable helper cursor, so the cursor lives and
+    dies with its own connection: no module-level registry keeps either
+    alive, and a cursor can never be handed to a different connection.
+    """
+
+    helper_cursor = None
+
+
 def insert_case(conn, case_id: str, state: CaseState):
     """
     Inserts a case with a known state.
@@ -21,11 +55,58 @@ def insert_case(conn, case_id: str, state: CaseState):
     because tests need controlled starting conditions.
     """
 
-    conn.execute(
-        """
-        INSERT INTO cases (id, title, current_state, data)
-        VALUES (?, ?, ?, ?)
-        """,
+    _cursor(conn).execute(
+        _INSERT_CASE_SQL,
         (case_id, "Test Case", state.value, "{}"),
     )
     conn.commit()
+
+
+def insert_and_fetch(conn, case_id: str, state: CaseState):
+    """
+    insert_case + fetch_current_state in ONE statement.
+
+    INSERT ... RETURNING (SQLite >= 3.35) hands back the stored state
+    from the insert itself, so a test can verify its starting condition
+    without a separate SELECT.
+    """
+
+    stored = _cursor(conn).execute(
+        _INSERT_CASE_RETURNING_SQL,
+        (case_id, "Test Case", state.value, "{}"),
+    ).fetchone()[0]
+    conn.commit()
+
+    return stored
+
+
+def fetch_current_state(conn, case_id: str):
+    """
+    Returns the case's current_state, or None if the case does not exist.
+    """
+
+    row = _cursor(conn).execute(_CURRENT_STATE_SQL, (case_id,)).fetchone()
+    return None if row is None else row[0]
+
+
+def fetch_audit_rows(conn, case_id: str) -> list:
+    """
+    Returns the case's audit rows (from_state, to_state, reason, metadata),
+    oldest first.
+    """
+
+    return _cursor(conn).execute(_AUDIT_ROWS_SQL, (case_id,)).fetchall()
+
+
+def _cursor(conn):
+    """
+    The cursor for the setup / verification statements.
+
+    Fixture connections reuse the cursor the fixture attached (the
+    statements themselves are already prepared once per connection by
+    sqlite3's statement cache, so this also skips allocating a Cursor
+    per assertion). Other connections get a fresh cursor.
+    """
+
+    cursor = getattr(conn, "helper_cursor", None)
+    return conn.cursor() if cursor is None else cursor
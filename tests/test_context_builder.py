@@ -0,0 +1,69 @@
+"""
+Context Builder Tests
+
+Purpose:
+--------
+Verify ContextBuilder shapes case data deterministically: derived
+fields are measured against the given reference date, and a batch
+shares one reference date.
+"""
+
+from datetime import date
+
+import pytest
+
+import builders.context_builder as context_builder
+from builders.context_builder import ContextBuilder
+from repositories.protocols import Case
+
+
+TODAY = date(2024, 1, 24)
+
+
+def _case(case_id="C-1", **data):
+    return Case(case_id=case_id, current_state="CREATED", case_type="loan", data=data)
+
+
+def test_build_uses_given_today():
+    context = ContextBuilder.build(_case(amount=50000, created_at="2024-01-01"), today=TODAY)
+
+    assert context == {
+        "amount": 50000,
+        "created_at": "2024-01-01",
+        "case_id": "C-1",
+        "current_state": "CREATED",
+        "case_type": "loan",
+        "days_open": 23,
+    }
+
+
+def test_build_without_created_at_has_no_days_open():
+    assert "days_open" not in ContextBuilder.build(_case(amount=1), today=TODAY)
+
+
+@pytest.mark.parametrize(
+    "created_at",
+    ["2024-01-23", "2024-01-23T00:00:01", "2024-01-23T23:59:59+05:00"],
+)
+def test_days_open_counts_calendar_days(created_at):
+    # Only the date part counts: any time on the previous day is one day open
+    assert ContextBuilder.build(_case(created_at=created_at), today=TODAY)["days_open"] == 1
+
+
+def test_build_many_reads_the_clock_once(monkeypatch):
+    calls = []
+
+    class FrozenDate(date):
+        @classmethod
+        def today(cls):
+            calls.append(None)
+            return TODAY
+
+    monkeypatch.setattr(context_builder, "date", FrozenDate)
+
+    cases = [_case("C-1", created_at="2024-01-01"), _case("C-2", created_at="2024-01-20")]
+    contexts = ContextBuilder.build_many(iter(cases))
+
+    assert len(calls) == 1
+    assert [c["case_id"] for c in contexts] == ["C-1", "C-2"]
+    assert [c["days_open"] for c in contexts] == [23, 4]
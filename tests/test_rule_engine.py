@@ -3,7 +3,10 @@
 import pytest
 
 from core.rule_engine import (
+    CompiledRuleSet,
+    compile_condition,
     evaluate_rules,
+    evaluate_rules_batch,
     InvalidRuleDefinition,
     MissingContextField,
     RuleEvaluationTypeError,
@@ -221,10 +224,225 @@ def test_engine_error_is_captured_safely(monkeypatch):
 
     # Force an unexpected engine bug
     from core import rule_engine
-    monkeypatch.setattr(rule_engine, "_evaluate_node", lambda *_: 1 / 0)
+    monkeypatch.setattr(rule_engine, "compile_condition", lambda *_: lambda _ctx: 1 / 0)
 
     result = evaluate_rules(context=context, rules=rules)
 
     trace = result["trace"][0]
     assert trace["evaluation_status"] == "FAILED_ENGINE_ERROR"
-    assert "UNEXPECTED ENGINE ERROR" in trace["error"]["message"]
\ No newline at end of file
+    assert "UNEXPECTED ENGINE ERROR" in trace["error"]["message"]
+
+
+def test_compile_condition_validates_short_circuited_branches():
+    """Definition errors are caught at compile time, even in unreachable branches"""
+    condition = {
+        "any": [
+            {"field": "amount", "operator": ">", "value": 1},
+            {"field": "amount", "operator": ">>", "value": 1},
+        ]
+    }
+
+    with pytest.raises(InvalidRuleDefinition):
+        compile_condition(condition)
+
+    result = evaluate_rules(
+        context={"amount": 100},
+        rules=[
+            {
+                "rule_id": "R-8",
+                "priority": 1,
+                "enabled": True,
+                "condition": condition,
+                "output_fact": {"flag": True},
+            }
+        ],
+    )
+
+    trace = result["trace"][0]
+    assert trace["evaluation_status"] == "FAILED_INVALID_DEFINITION"
+    assert trace["evaluated"] is False
+    assert result["facts"] == {}
+
+
+def test_memoize_evaluates_shared_subtree_once():
+    """Identical logical subtrees across rules are evaluated once per context"""
+
+    class CountingContext(dict):
+        lookups = 0
+
+        def __getitem__(self, key):
+            CountingContext.lookups += 1
+            return super().__getitem__(key)
+
+    shared = {"all": [{"field": "amount", "operator": ">", "value": 100}]}
+    rules = [
+        {
+            "rule_id": f"R-{i}",
+            "priority": i,
+            "enabled": True,
+            "condition": {"all": [shared]},
+            "output_fact": {f"fact_{i}": True},
+        }
+        for i in range(3)
+    ]
+
+    result = evaluate_rules(
+        context=CountingContext(amount=500), rules=rules, memoize=True
+    )
+
+    assert result["facts"] == {"fact_0": True, "fact_1": True, "fact_2": True}
+    assert CountingContext.lookups == 1
+
+
+def test_memoize_does_not_share_subtrees_that_differ_only_in_type():
+    """[1, 2] vs (1, 2) (or 1 vs True) are different subtrees"""
+    rules = [
+        {
+            "rule_id": rule_id,
+            "priority": priority,
+            "enabled": True,
+            "condition": {"all": [{"field": "x", "operator": "==", "value": value}]},
+            "output_fact": {rule_id: True},
+        }
+        for priority, (rule_id, value) in enumerate(
+            [("a", [1, 2]), ("b", (1, 2)), ("c", 1), ("d", True)]
+        )
+    ]
+
+    for context in ({"x": [1, 2]}, {"x": 1}):
+        plain = evaluate_rules(context=context, rules=rules)
+        memoized = evaluate_rules(context=context, rules=rules, memoize=True)
+        assert memoized["facts"] == plain["facts"]
+
+    assert evaluate_rules(
+        context={"x": [1, 2]}, rules=rules, memoize=True
+    )["facts"] == {"a": True}
+
+def test_compiled_rule_set_is_reusable_across_contexts():
+    """A rule set compiled once evaluates each context independently"""
+    rule_set = CompiledRuleSet([
+        {
+            "rule_id": "R-high",
+            "priority": 10,
+            "enabled": True,
+            "condition": {"field": "amount", "operator": ">", "value": 1000},
+            "output_fact": {"risk": "HIGH"},
+        },
+        {
+            "rule_id": "R-low",
+            "priority": 1,
+            "enabled": True,
+            "condition": {"field": "amount", "operator": ">", "value": 100},
+            "output_fact": {"risk": "LOW"},
+        },
+    ])
+
+    high = rule_set.evaluate({"amount": 2000})
+    low = rule_set.evaluate({"amount": 500})
+    missing = rule_set.evaluate({})
+
+    assert high["facts"] == {"risk": "HIGH"}
+    assert [t["rule_id"] for t in high["trace"]] == ["R-low", "R-high"]
+    assert low["facts"] == {"risk": "LOW"}
+    assert missing["facts"] == {}
+    assert {t["evaluation_status"] for t in missing["trace"]} == {"FAILED_MISSING_CONTEXT"}
+
+    # evaluate_rules takes the compiled set as is
+    assert evaluate_rules(context={"amount": 2000}, rules=rule_set) == high
+    assert evaluate_rules(context={"amount": 500}, rules=rule_set, trace=False) == {
+        "facts": {"risk": "LOW"}, "trace": None,
+    }
+
+
+def test_batch_evaluation_matches_single_evaluation():
+    """Batch results equal per-context evaluate_rules results, in order"""
+    rules = [
+        {
+            "rule_id": "R-1",
+            "priority": 1,
+            "enabled": True,
+            "condition": {
+                "all": [
+                    {"field": "amount", "operator": ">", "value": 1000},
+                    {"field": "region", "operator": "in", "value": ["EU", "US"]},
+                ]
+            },
+            "output_fact": {"review": True},
+        }
+    ]
+    contexts = [
+        {"amount": 5000, "region": "EU"},
+        {"amount": 5000, "region": "APAC"},
+        {"amount": 10},
+    ]
+
+    results = evaluate_rules_batch(contexts=contexts, rules=rules)
+
+    assert results == [evaluate_rules(context=c, rules=rules) for c in contexts]
+    assert [r["facts"] for r in results] == [{"review": True}, {}, {}]
+
+
+def test_nested_logical_chains_keep_semantics_when_flattened():
+    """Nested all/any collapse at compile time without changing results"""
+    a = {"field": "a", "operator": "==", "value": 1}
+    b = {"field": "b", "operator": "==", "value": 2}
+
+    nested_all = compile_condition({"all": [{"all": [a, {"all": []}]}, {"all": [b]}]})
+    nested_any = compile_condition({"any": [{"any": [{"any": []}]}, {"any": [a, b]}]})
+
+    assert nested_all({"a": 1, "b": 2}) is True
+    assert nested_all({"a": 1, "b": 3}) is False
+    assert nested_any({"a": 0, "b": 2}) is True
+    assert nested_any({"a": 0, "b": 0}) is False
+
+    # Short-circuit order is preserved: 'b' is never read once 'a' fails
+    assert nested_all({"a": 0}) is False
+
+    # Same-kind children were spliced into one n-ary node
+    assert nested_all.kind == "all" and len(nested_all.children) == 2
+    assert nested_any.kind == "any" and len(nested_any.children) == 2
+
+
+def test_trace_opt_out_returns_same_facts():
+    """trace=False skips trace bookkeeping but produces identical facts"""
+    rules = [
+        {
+            "rule_id": "R-ok",
+            "priority": 1,
+            "enabled": True,
+            "condition": {"field": "amount", "operator": ">", "value": 100},
+            "output_fact": {"risk": "LOW"},
+        },
+        {
+            "rule_id": "R-missing",
+            "priority": 2,
+            "enabled": True,
+            "condition": {"field": "credit_score", "operator": ">", "value": 700},
+            "output_fact": {"risk": "HIGH"},
+        },
+        {
+            "rule_id": "R-disabled",
+            "priority": 3,
+            "enabled": False,
+            "condition": {"field": "amount", "operator": ">", "value": 1},
+            "output_fact": {"risk": "NONE"},
+        },
+    ]
+    context = {"amount": 500}
+
+    traced = evaluate_rules(context=context, rules=rules)
+    untraced = evaluate_rules(context=context, rules=rules, trace=False)
+
+    assert untraced["facts"] == traced["facts"] == {"risk": "LOW"}
+    assert untraced["trace"] is None
+
+
+def test_membership_operators_match_sequence_semantics():
+    """in/not_in against literal lists behave like a plain list scan"""
+    is_in = compile_condition({"field": "x", "operator": "in", "value": ["EU", 1, None]})
+    not_in = compile_condition({"field": "x", "operator": "not_in", "value": ["EU", 1, None]})
+
+    for value in ["EU", 1, 1.0, True, None, "US", 2, ["EU"], {"a": 1}]:
+        expected = value in ["EU", 1, None]
+        assert is_in({"x": value}) is expected
+        assert not_in({"x": value}) is (not expected)
@@ -0,0 +1,74 @@
+"""
+Rules Cache Tests
+
+Purpose:
+--------
+Verify CachedRulesRepository only reaches the inner repository on a miss,
+and reloads after invalidation or a version change.
+"""
+
+from core.rule_engine import CompiledRuleSet
+from repositories.rules_cache import CachedRulesRepository
+
+
+RULES = [
+    {"rule_id": "R-2", "priority": 2},
+    {"rule_id": "R-1", "priority": 1},
+]
+
+
+def test_rules_fetched_once_and_sorted(mock_factory):
+    inner = mock_factory()
+    inner.get_active_rules.return_value = RULES
+    cache = CachedRulesRepository(inner)
+
+    first = cache.get_active_rules("loan")
+    second = cache.get_active_rules("loan")
+
+    inner.get_active_rules.assert_called_once_with("loan")
+    assert second is first
+    assert [r["rule_id"] for r in first] == ["R-1", "R-2"]
+
+
+def test_invalidate_forces_reload(mock_factory):
+    inner = mock_factory()
+    inner.get_active_rules.return_value = RULES
+    cache = CachedRulesRepository(inner)
+
+    cache.get_active_rules("loan")
+    cache.invalidate("loan")
+    cache.get_active_rules("loan")
+    cache.invalidate()
+    cache.get_active_rules("loan")
+
+    assert inner.get_active_rules.call_count == 3
+
+
+def test_version_probe_change_forces_reload(mock_factory):
+    inner = mock_factory()
+    inner.get_active_rules.return_value = RULES
+    versions = {"loan": 1}
+    cache = CachedRulesRepository(inner, version_probe=versions.__getitem__)
+
+    cache.get_active_rules("loan")
+    cache.get_active_rules("loan")
+    assert inner.get_active_rules.call_count == 1
+
+    versions["loan"] = 2
+    cache.get_active_rules("loan")
+    assert inner.get_active_rules.call_count == 2
+
+
+def test_compiled_rules_reused_until_reload(mock_factory):
+    inner = mock_factory()
+    inner.get_active_rules.return_value = RULES
+    cache = CachedRulesRepository(inner)
+
+    compiled = cache.get_compiled_rules("loan")
+    assert isinstance(compiled, CompiledRuleSet)
+    assert cache.get_compiled_rules("loan") is compiled
+    inner.get_active_rules.assert_called_once_with("loan")
+
+    cache.invalidate("loan")
+    assert cache.get_compiled_rules("loan") is not compiled
+    assert inner.get_active_rules.call_count == 2
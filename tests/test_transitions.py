@@ -1,117 +1,506 @@
-#5.1 Illegal transition must fail
+import json
+import sqlite3
+from pathlib import Path
+
 import pytest
+from core.guards import GuardViolation
 from core.state import CaseState
-from core.transition_engine import transition_case, IllegalTransition
-from tests.helpers import insert_case
+from core.transition_engine import (
+    CaseNotFoundError,
+    IllegalTransition,
+    NoopTransition,
+    TransitionRequest,
+    execute_transition,
+    execute_transitions,
+    transition_case,
+    transition_cases,
+)
+from db.database import close_connections, get_connection, get_reader_connection
+from tests.helpers import (
+    fetch_audit_rows,
+    fetch_current_state,
+    insert_and_fetch,
+    insert_case,
+)
 
+SCHEMA_PATH = Path(__file__).resolve().parents[1] / "db" / "schema.sql"
 
-def test_illegal_transition_rejected(db_conn):
-    insert_case(db_conn, "c1", CaseState.CREATED)
-
-    with pytest.raises(IllegalTransition):
-        transition_case(
-            case_id="c1",
-            from_state=CaseState.CREATED,
-            to_state=CaseState.APPROVED,  # illegal jump
-            facts={},
-            reason="Invalid jump",
-            db_conn=db_conn,
-        )
+# States (and their stored values) resolved once, not per assertion
+CREATED, UNDER_REVIEW, APPROVED = (
+    CaseState.CREATED, CaseState.UNDER_REVIEW, CaseState.APPROVED
+)
+_V_CREATED, _V_UNDER_REVIEW, _V_APPROVED = (
+    CREATED.value, UNDER_REVIEW.value, APPROVED.value
+)
 
 
-#5.2 Guard failure blocks transition AND rolls back
-def test_guard_failure_blocks_transition(db_conn):
-    insert_case(db_conn, "c2", CaseState.CREATED)
+# 5.1 - 5.4 (+ no-op) share one body:
+# insert the case, attempt the transition, then check the final state and
+# the audit trail. Failures must leave both untouched.
+@pytest.mark.parametrize(
+    "case_id,from_s,to_s,facts,raises,final",
+    [
+        # 5.1 Illegal transition must fail
+        pytest.param(
+            "c1", CREATED, APPROVED,  # illegal jump
+            {}, IllegalTransition, CREATED,
+            id="illegal_transition_rejected",
+        ),
+        # 5.2 Guard failure blocks transition AND rolls back
+        pytest.param(
+            "c2", CREATED, UNDER_REVIEW,
+            {"required_fields_complete": False}, GuardViolation, CREATED,
+            id="guard_failure_blocks_transition",
+        ),
+        # 5.3 Valid transition succeeds / 5.4 audit log must exist for it
+        pytest.param(
+            "c3", CREATED, UNDER_REVIEW,
+            {"required_fields_complete": True}, None, UNDER_REVIEW,
+            id="valid_transition_writes_audit_log",
+        ),
+        # Same-state request is rejected without writing
+        pytest.param(
+            "n1", UNDER_REVIEW, UNDER_REVIEW,
+            {}, NoopTransition, UNDER_REVIEW,
+            id="noop_transition_rejected",
+        ),
+    ],
+)
+def test_transition_case(db_conn, case_id, from_s, to_s, facts, raises, final):
+    assert insert_and_fetch(db_conn, case_id, from_s) == from_s.value
 
-    with pytest.raises(Exception):
-        transition_case(
-            case_id="c2",
-            from_state=CaseState.CREATED,
-            to_state=CaseState.UNDER_REVIEW,
-            facts={"required_fields_complete": False},
-            reason="Missing fields",
-            db_conn=db_conn,
-        )
+    attempt = dict(
+        case_id=case_id,
+        from_state=from_s,
+        to_state=to_s,
+        facts=facts,
+        reason="Scenario",
+        db_conn=db_conn,
+    )
 
-    row = db_conn.execute(
-        "SELECT current_state FROM cases WHERE id = ?",
-        ("c2",),
-    ).fetchone()
+    if raises is None:
+        transition_case(**attempt)
+    else:
+        with pytest.raises(raises):
+            transition_case(**attempt)
 
-    assert row["current_state"] == CaseState.CREATED.value
+    assert fetch_current_state(db_conn, case_id) == final.value
 
+    audit_rows = fetch_audit_rows(db_conn, case_id)
 
-#5.3 Valid transition succeeds
-def test_valid_transition_succeeds(db_conn):
-    insert_case(db_conn, "c3", CaseState.CREATED)
+    if raises is not None:
+        assert audit_rows == []
+        return
 
-    transition_case(
-        case_id="c3",
-        from_state=CaseState.CREATED,
-        to_state=CaseState.UNDER_REVIEW,
-        facts={"required_fields_complete": True},
-        reason="Initial review",
-        db_conn=db_conn,
-    )
+    (audit,) = audit_rows
+    assert audit["from_state"] == from_s.value
+    assert audit["to_state"] == to_s.value
+    assert audit["reason"] == "Scenario"
+    assert json.loads(audit["metadata"]) == facts
 
-    row = db_conn.execute(
-        "SELECT current_state FROM cases WHERE id = ?",
-        ("c3",),
+    # One timestamp stamps both the state update and the audit row
+    stamps = db_conn.execute(
+        """
+        SELECT c.updated_at, a.created_at
+        FROM cases c JOIN audit_logs a ON a.case_id = c.id
+        WHERE c.id = ?
+        """,
+        (case_id,),
     ).fetchone()
+    assert stamps[0] == stamps[1]
 
-    assert row["current_state"] == CaseState.UNDER_REVIEW.value
 
+@pytest.mark.parametrize("encoder", ["_encode_facts_orjson", "_encode_facts_stdlib"])
+@pytest.mark.parametrize(
+    "extra, stored",
+    [
+        ({"scores": {1: 0.5}}, {"scores": {"1": 0.5}}),
+        ({"big": 1 << 70}, {"big": str(1 << 70)}),
+    ],
+    ids=["non_str_key", "big_int"],
+)
+def test_awkward_facts_do_not_block_transition(db_conn, monkeypatch, encoder, extra, stored):
+    from core import transition_engine as engine
 
-#5.4 Audit log must exist for successful transition
-def test_audit_log_written(db_conn):
-    insert_case(db_conn, "c4", CaseState.CREATED)
+    encode = getattr(engine, encoder, None)
+    if encode is None:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(engine, "_encode_facts", encode)
+
+    insert_case(db_conn, "w1", CREATED)
 
     transition_case(
-        case_id="c4",
-        from_state=CaseState.CREATED,
-        to_state=CaseState.UNDER_REVIEW,
-        facts={"required_fields_complete": True},
-        reason="Audit test",
+        case_id="w1",
+        from_state=CREATED,
+        to_state=UNDER_REVIEW,
+        facts={"required_fields_complete": True, **extra},
+        reason="Awkward facts",
         db_conn=db_conn,
     )
 
-    row = db_conn.execute(
-        """
-        SELECT from_state, to_state, reason
-        FROM audit_logs
-        WHERE case_id = ?
-        """,
-        ("c4",),
-    ).fetchone()
+    assert fetch_current_state(db_conn, "w1") == _V_UNDER_REVIEW
+    (audit,) = fetch_audit_rows(db_conn, "w1")
+    assert json.loads(audit["metadata"]) == {"required_fields_complete": True, **stored}
 
-    assert row["from_state"] == CaseState.CREATED.value
-    assert row["to_state"] == CaseState.UNDER_REVIEW.value
-    assert row["reason"] == "Audit test"
 
 """
 5.5 Atomicity: no ghost updates
 
 We simulate a failure inside the transaction.
 """
-def test_atomicity_no_partial_commit(db_conn):
-    insert_case(db_conn, "c5", CaseState.CREATED)
+def test_atomicity_no_partial_commit(db_conn, monkeypatch):
+    insert_case(db_conn, "c5", CREATED)
 
-    # Break audit logging intentionally
-    db_conn.execute("DROP TABLE audit_logs")
+    # Break audit logging intentionally (after the state UPDATE ran)
+    def failing_audit_write(tx, audit_params):
+        raise RuntimeError("audit write failed")
 
-    with pytest.raises(Exception):
+    monkeypatch.setattr("core.transition_engine._write_audit", failing_audit_write)
+
+    with pytest.raises(RuntimeError):
         transition_case(
             case_id="c5",
-            from_state=CaseState.CREATED,
-            to_state=CaseState.UNDER_REVIEW,
+            from_state=CREATED,
+            to_state=UNDER_REVIEW,
             facts={"required_fields_complete": True},
             reason="Should rollback",
             db_conn=db_conn,
         )
 
-    row = db_conn.execute(
-        "SELECT current_state FROM cases WHERE id = ?",
-        ("c5",),
-    ).fetchone()
+    assert fetch_current_state(db_conn, "c5") == _V_CREATED
+    assert fetch_audit_rows(db_conn, "c5") == []
+
+
+#5.6 Public entry point runs against a file database via the cached connection
+def test_execute_transition_reuses_cached_connection(tmp_path):
+    db_path = str(tmp_path / "workflow.db")
+
+    conn = get_connection(db_path)
+    conn.executescript(SCHEMA_PATH.read_text())
+    insert_case(conn, "c6", CREATED)
+
+    try:
+        result = execute_transition(
+            case_id="c6",
+            action=_V_UNDER_REVIEW,
+            facts={"required_fields_complete": True},
+            db_path=db_path,
+        )
+
+        assert result["new_state"] == _V_UNDER_REVIEW
+        assert get_connection(db_path) is conn
+        assert get_connection(db_path, sqlite3.Row) is not conn
+
+        row = conn.execute(
+            "SELECT current_state FROM cases WHERE id = ?",
+            ("c6",),
+        ).fetchone()
+
+        # Default connections return plain tuples
+        assert row == (_V_UNDER_REVIEW,)
+
+        # The state lookup runs on a read-only connection that sees
+        # every committed transition
+        execute_transition(
+            case_id="c6",
+            action=_V_APPROVED,
+            facts={"risk_rules_passed": True, "amount_within_threshold": True},
+            db_path=db_path,
+        )
+        reader = get_reader_connection(db_path)
+        assert reader.execute(
+            "SELECT current_state FROM cases WHERE id = ?", ("c6",)
+        ).fetchone() == (_V_APPROVED,)
+
+        with pytest.raises(sqlite3.OperationalError):
+            reader.execute("DELETE FROM cases")
+    finally:
+        close_connections()
+
+
+def test_closed_cached_connection_is_reopened(tmp_path):
+    db_path = str(tmp_path / "workflow.db")
+    get_connection(db_path).executescript(SCHEMA_PATH.read_text())
+
+    try:
+        for get in (get_connection, get_reader_connection):
+            stale = get(db_path)
+            stale.close()  # misuse: the handle is shared
+
+            fresh = get(db_path)
+            assert fresh is not stale
+            assert fresh.execute("SELECT COUNT(*) FROM cases").fetchone() == (0,)
+            assert get(db_path) is fresh
+    finally:
+        close_connections()
+
+
+def test_execute_transition_accepts_preloaded_state(db_conn, monkeypatch):
+    insert_case(db_conn, "c7", CREATED)
+    monkeypatch.setattr("core.transition_engine.get_writer_connection", lambda _path: db_conn)
+
+    result = execute_transition(
+        case_id="c7",
+        action=_V_UNDER_REVIEW,
+        facts={"required_fields_complete": True},
+        from_state_value=_V_CREATED,
+    )
+
+    assert result["audit_entry"]["from_state"] == _V_CREATED
+    assert fetch_current_state(db_conn, "c7") == _V_UNDER_REVIEW
+
+
+def test_preloaded_state_for_missing_case_writes_nothing(db_conn, monkeypatch):
+    monkeypatch.setattr("core.transition_engine.get_writer_connection", lambda _path: db_conn)
+
+    with pytest.raises(CaseNotFoundError):
+        execute_transition(
+            case_id="ghost",
+            action=_V_UNDER_REVIEW,
+            facts={"required_fields_complete": True},
+            from_state_value=_V_CREATED,
+        )
+
+    assert fetch_audit_rows(db_conn, "ghost") == []
+
+
+@pytest.mark.parametrize("stored", [UNDER_REVIEW, CaseState.CLOSED])
+def test_stale_preloaded_state_is_rejected(db_conn, monkeypatch, stored):
+    # The repository still says CREATED; the database has moved on
+    insert_case(db_conn, "s1", stored)
+    monkeypatch.setattr("core.transition_engine.get_writer_connection", lambda _path: db_conn)
 
-    assert row["current_state"] == CaseState.CREATED.value
+    with pytest.raises(IllegalTransition):
+        execute_transition(
+            case_id="s1",
+            action=_V_UNDER_REVIEW,
+            facts={"required_fields_complete": True},
+            from_state_value=_V_CREATED,
+        )
+
+    assert fetch_current_state(db_conn, "s1") == stored.value
+    assert fetch_audit_rows(db_conn, "s1") == []
+
+
+def test_bulk_transition_rejects_stale_item(db_conn):
+    insert_case(db_conn, "b3", CREATED)
+    insert_case(db_conn, "b4", UNDER_REVIEW)
+
+    with pytest.raises(IllegalTransition):
+        transition_cases(
+            [
+                TransitionRequest("b3", CREATED, UNDER_REVIEW,
+                                  {"required_fields_complete": True}, "ok"),
+                TransitionRequest("b4", CREATED, UNDER_REVIEW,  # stale
+                                  {"required_fields_complete": True}, "stale"),
+            ],
+            db_conn,
+        )
+
+    assert fetch_current_state(db_conn, "b3") == _V_CREATED
+    assert fetch_audit_rows(db_conn, "b3") == []
+    assert fetch_audit_rows(db_conn, "b4") == []
+
+
+def test_bulk_transition_is_all_or_nothing(db_conn):
+    insert_case(db_conn, "b1", CREATED)
+    insert_case(db_conn, "b2", CREATED)
+
+    with pytest.raises(GuardViolation):
+        transition_cases(
+            [
+                TransitionRequest("b1", CREATED, UNDER_REVIEW,
+                                  {"required_fields_complete": True}, "ok"),
+                TransitionRequest("b2", CREATED, UNDER_REVIEW,
+                                  {"required_fields_complete": False}, "blocked"),
+            ],
+            db_conn,
+        )
+
+    states = [fetch_current_state(db_conn, case_id) for case_id in ("b1", "b2")]
+    assert states == [_V_CREATED, _V_CREATED]
+
+    transition_cases(
+        [
+            TransitionRequest("b1", CREATED, UNDER_REVIEW,
+                              {"required_fields_complete": True}, "ok"),
+            TransitionRequest("b2", CREATED, UNDER_REVIEW,
+                              {"required_fields_complete": True}, "ok"),
+        ],
+        db_conn,
+    )
+
+    states = [fetch_current_state(db_conn, case_id) for case_id in ("b1", "b2")]
+    assert states == [_V_UNDER_REVIEW, _V_UNDER_REVIEW]
+    assert db_conn.execute("SELECT COUNT(*) FROM audit_logs").fetchone()[0] == 2
+
+
+def test_compiled_guards_match_evaluate_guards():
+    from core.guards import compile_guards, evaluate_guards
+
+    for guards in (
+        {"required_fields_complete": True},
+        {"risk_rules_passed": True, "amount_within_threshold": True},
+    ):
+        check = compile_guards(guards)
+
+        for facts in (
+            {},
+            {"required_fields_complete": True},
+            {"risk_rules_passed": True, "amount_within_threshold": False},
+            {"risk_rules_passed": True, "amount_within_threshold": True},
+        ):
+            try:
+                evaluate_guards(guards, facts)
+                expected = None
+            except GuardViolation as exc:
+                expected = str(exc)
+
+            try:
+                check(facts)
+                actual = None
+            except GuardViolation as exc:
+                actual = str(exc)
+
+            assert actual == expected
+
+
+def test_execute_transition_unknown_case(tmp_path):
+    db_path = str(tmp_path / "workflow.db")
+    get_connection(db_path).executescript(SCHEMA_PATH.read_text())
+
+    try:
+        with pytest.raises(CaseNotFoundError) as excinfo:
+            execute_transition(
+                case_id="missing",
+                action=_V_UNDER_REVIEW,
+                facts={},
+                db_path=db_path,
+            )
+
+        assert excinfo.value.case_id == "missing"
+        assert str(excinfo.value) == "Case not found: missing"
+    finally:
+        close_connections()
+
+
+def test_bulk_transition_accepts_an_iterator(db_conn):
+    insert_case(db_conn, "i1", CREATED)
+
+    transition_cases(
+        iter([
+            TransitionRequest("i1", CREATED, UNDER_REVIEW,
+                              {"required_fields_complete": True}, "ok"),
+        ]),
+        db_conn,
+    )
+
+    assert fetch_current_state(db_conn, "i1") == _V_UNDER_REVIEW
+    assert len(fetch_audit_rows(db_conn, "i1")) == 1
+
+
+def test_bulk_transition_skips_noops(db_conn):
+    insert_case(db_conn, "m1", CREATED)
+    insert_case(db_conn, "m2", UNDER_REVIEW)
+
+    transition_cases(
+        [
+            TransitionRequest("m1", CREATED, UNDER_REVIEW,
+                              {"required_fields_complete": True}, "ok"),
+            TransitionRequest("m2", UNDER_REVIEW, UNDER_REVIEW, {}, "retry"),
+        ],
+        db_conn,
+    )
+
+    assert fetch_current_state(db_conn, "m1") == _V_UNDER_REVIEW
+    assert len(fetch_audit_rows(db_conn, "m1")) == 1
+    assert fetch_current_state(db_conn, "m2") == _V_UNDER_REVIEW
+    assert fetch_audit_rows(db_conn, "m2") == []
+
+
+def test_execute_transitions_reports_per_request_results(db_conn, monkeypatch):
+    insert_case(db_conn, "e1", CREATED)
+    insert_case(db_conn, "e2", UNDER_REVIEW)
+    monkeypatch.setattr("core.transition_engine.get_reader_connection", lambda _path: db_conn)
+    monkeypatch.setattr("core.transition_engine.get_writer_connection", lambda _path: db_conn)
+
+    results = execute_transitions(requests=[
+        {"case_id": "e1", "action": _V_UNDER_REVIEW,
+         "facts": {"required_fields_complete": True}},
+        {"case_id": "e2", "action": _V_UNDER_REVIEW, "facts": {}},
+    ])
+
+    assert [r["status"] for r in results] == ["SUCCESS", "NOOP"]
+    assert results[0]["audit_entry"]["from_state"] == _V_CREATED
+    assert results[1] == {"new_state": _V_UNDER_REVIEW, "status": "NOOP", "audit_entry": None}
+    assert fetch_current_state(db_conn, "e1") == _V_UNDER_REVIEW
+    assert len(fetch_audit_rows(db_conn, "e1")) == 1
+    assert fetch_audit_rows(db_conn, "e2") == []
+
+
+def test_execute_transitions_guard_failure_writes_nothing(db_conn, monkeypatch):
+    insert_case(db_conn, "e3", CREATED)
+    insert_case(db_conn, "e4", CREATED)
+    monkeypatch.setattr("core.transition_engine.get_reader_connection", lambda _path: db_conn)
+    monkeypatch.setattr("core.transition_engine.get_writer_connection", lambda _path: db_conn)
+
+    with pytest.raises(GuardViolation):
+        execute_transitions(requests=[
+            {"case_id": "e3", "action": _V_UNDER_REVIEW,
+             "facts": {"required_fields_complete": True}},
+            {"case_id": "e4", "action": _V_UNDER_REVIEW,
+             "facts": {"required_fields_complete": False}},
+        ])
+
+    assert fetch_current_state(db_conn, "e3") == _V_CREATED
+    assert fetch_audit_rows(db_conn, "e3") == []
+
+
+def test_audit_encoders_agree():
+    """The stdlib fallback stores what orjson stores, whatever the facts"""
+    from dataclasses import dataclass
+    from datetime import date, datetime
+
+    from core import transition_engine as engine
+
+    orjson_encode = getattr(engine, "_encode_facts_orjson", None)
+    if orjson_encode is None:
+        pytest.skip("orjson not installed")
+
+    @dataclass
+    class Point:
+        x: int
+
+    facts = {
+        "flag": True,
+        "count": 3,
+        "ratio": 0.5,
+        "name": "é",
+        "missing": None,
+        "opened": datetime(2024, 1, 1, 9, 30),
+        "due": date(2024, 2, 1),
+        "state": CREATED,
+        "point": Point(1),
+        "nan": float("nan"),
+        "inf": float("inf"),
+        "nested": {"b": [1, (2, 3)], "a": {"z": 1, "y": float("-inf")}},
+    }
+
+    stored = engine._encode_facts_stdlib(facts)
+    assert stored == orjson_encode(facts)
+    assert json.loads(stored)["nan"] is None
+    assert json.loads(stored)["opened"] == "2024-01-01 09:30:00"
+
+    # Shapes orjson cannot write natively are normalized, never rejected
+    awkward = (
+        {1: True},
+        {"a": {1: True}},
+        {"a": 1, 2: "b"},
+        {None: 1, True: 2, 0.5: 3, 1e20: 4, 2.5e-5: 5, 1e-7: 6},
+        {float("-inf"): 1},
+        {CREATED: 1, date(2024, 2, 1): 2, (1, 2): 3},
+        {"big": 1 << 64, "small": -(1 << 63) - 1, "ok": (1 << 64) - 1},
+        {"nested": [{"big": 1 << 70, 1 << 70: "key"}]},
+    )
+    for facts in awkward:
+        assert engine._encode_facts_stdlib(facts) == orjson_encode(facts)
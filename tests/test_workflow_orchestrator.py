@@ -21,223 +21,360 @@ Constraints:
 - No real state transitions
 """
 
-from unittest.mock import Mock, patch
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, NamedTuple
 
 import pytest
 
-from core.workflow_orchestrator import run_workflow_step
+import core.workflow_orchestrator as orchestrator
+from core.rule_engine import CompiledRuleSet
+from core.workflow_orchestrator import run_workflow_step, run_workflow_steps
 from repositories.protocols import Case
 
-'''
-Facts must pass through UNCHANGED (critical invariant)
-#This is the most important test.
-'''
-def test_orchestrator_passes_facts_unchanged():
-    """
-    Facts produced by the Rule Engine must be passed to the
-    Transition Engine without modification, filtering, or enrichment.
-    """
 
-    mock_case_repo = Mock()
-    mock_rules_repo = Mock()
+class StubCaseRepo:
+    """CaseRepository stand-in: returns .case, records each call's args."""
 
-    case = Case(
-        case_id="C-123",
-        current_state="pending_review",
-        case_type="loan_application",
-        data={"amount": 50000, "credit_score": 750},
-    )
-    mock_case_repo.get_case.return_value = case
-
-    mock_rules_repo.get_active_rules.return_value = [
-        {
-            "rule_id": "R-1",
-            "priority": 1,
-            "enabled": True,
-            "condition": {"field": "amount", "operator": ">", "value": 10000},
-            "output_fact": {"high_value": True},
-        }
-    ]
-
-    with patch("core.workflow_orchestrator.evaluate_rules") as mock_rule_engine, \
-         patch("core.workflow_orchestrator.execute_transition") as mock_transition:
-
-        mock_rule_engine.return_value = {
-            "facts": {"high_value": True, "approved": True},
-            "trace": [{"rule_id": "R-1", "status": "EVALUATED_TRUE"}],
-        }
+    __slots__ = ("case", "calls")
 
-        mock_transition.return_value = {
-            "new_state": "approved",
-            "status": "SUCCESS",
-            "audit_entry": {"action": "approve"},
-        }
+    def __init__(self, case=None):
+        self.case = case
+        self.calls = []
 
-        result = run_workflow_step(
-            case_id="C-123",
-            target_state="approved",
-            case_repository=mock_case_repo,
-            rules_repository=mock_rules_repo,
-        )
+    def get_case(self, *args):
+        self.calls.append(args)
+        return self.case
+
+
+class StubRulesRepo:
+    """RulesRepository stand-in: returns .rules, records each call's args."""
 
-        # ---- Assertions ----
+    __slots__ = ("rules", "calls")
 
-        # Transition engine called exactly once
-        mock_transition.assert_called_once()
+    def __init__(self, rules=()):
+        self.rules = list(rules)
+        self.calls = []
 
-        # Facts passed UNCHANGED
-        passed_facts = mock_transition.call_args.kwargs["facts"]
-        assert passed_facts == {"high_value": True, "approved": True}
+    def get_active_rules(self, *args):
+        self.calls.append(args)
+        return self.rules
 
-        # No extra keys introduced
-        assert set(passed_facts.keys()) == {"high_value", "approved"}
 
-        # Output preserved
-        assert result["facts"] == passed_facts
-        assert result["to_state"] == "approved"
+@pytest.fixture
+def repos():
+    """(case_repo, rules_repo) stubs, fresh for each test."""
+    return StubCaseRepo(), StubRulesRepo()
 
 
-#ContextBuilder must be invoked (delegation test)
-#This ensures the orchestrator does not construct context itself.
+@pytest.fixture(scope="module")
+def _engine_mocks(mock_factory):
+    """Engine stand-ins built once per module."""
+    return SimpleNamespace(
+        build_context=mock_factory(),
+        evaluate_rules=mock_factory(),
+        execute_transition=mock_factory(),
+        execute_transitions=mock_factory(),
+    )
+
 
-def test_orchestrator_delegates_context_building():
+@pytest.fixture(autouse=True)
+def engines(_engine_mocks, monkeypatch):
     """
-    Orchestrator must delegate context construction
-    to ContextBuilder and not inline logic.
+    Replaces the orchestrator's collaborators for every test.
+
+    Set directly on the already-imported module (no patch() target
+    resolution per test); tests configure .return_value as needed.
     """
 
-    mock_case_repo = Mock()
-    mock_rules_repo = Mock()
+    for mock in vars(_engine_mocks).values():
+        mock.reset_mock(return_value=True, side_effect=True)
 
-    case = Case(
-        case_id="C-456",
-        current_state="draft",
-        case_type="claim_review",
-        data={"claim_amount": 5000},
-    )
-    mock_case_repo.get_case.return_value = case
-    mock_rules_repo.get_active_rules.return_value = []
-
-    with patch("core.workflow_orchestrator.ContextBuilder.build") as mock_builder, \
-         patch("core.workflow_orchestrator.evaluate_rules") as mock_rule_engine, \
-         patch("core.workflow_orchestrator.execute_transition") as mock_transition:
-
-        mock_builder.return_value = {
-            "claim_amount": 5000,
-            "case_id": "C-456",
-            "current_state": "draft",
-            "case_type": "claim_review",
-        }
-
-        mock_rule_engine.return_value = {"facts": {}, "trace": []}
-        mock_transition.return_value = {
-            "new_state": "submitted",
-            "status": "SUCCESS",
-        }
+    monkeypatch.setattr(orchestrator.ContextBuilder, "build", _engine_mocks.build_context)
+    monkeypatch.setattr(orchestrator, "evaluate_rules", _engine_mocks.evaluate_rules)
+    monkeypatch.setattr(orchestrator, "execute_transition", _engine_mocks.execute_transition)
+    monkeypatch.setattr(orchestrator, "execute_transitions", _engine_mocks.execute_transitions)
 
-        run_workflow_step(
-            case_id="C-456",
-            target_state="submitted",
-            case_repository=mock_case_repo,
-            rules_repository=mock_rules_repo,
-        )
+    return _engine_mocks
 
-        mock_builder.assert_called_once_with(case)
+# -----------------------------------------------------------------------------
+# Scenarios
+# -----------------------------------------------------------------------------
+# One orchestration run per scenario; each differs only in its inputs and
+# in what it asserts afterwards.
 
+class Scenario(NamedTuple):
+    case: Case
+    target_state: str
+    rules: List[Dict[str, Any]]
+    rule_result: Dict[str, Any]
+    transition_result: Dict[str, Any]
+    check: Callable[..., None]
 
-#Rules must be loaded by case_type (no fallback logic)
 
-def test_orchestrator_loads_rules_by_case_type():
+def _facts_passed_unchanged(result, case, case_repo, rules_repo, engines):
     """
-    Rules must be fetched strictly by case_type.
-    No defaults or fallbacks allowed.
+    Facts produced by the Rule Engine must be passed to the
+    Transition Engine without modification, filtering, or enrichment.
+    (critical invariant - the most important check)
     """
 
-    mock_case_repo = Mock()
-    mock_rules_repo = Mock()
+    # Transition engine called exactly once
+    engines.execute_transition.assert_called_once()
 
-    case = Case(
-        case_id="C-789",
-        current_state="pending",
-        case_type="mortgage_application",
-        data={},
-    )
+    # Facts passed UNCHANGED
+    passed_facts = engines.execute_transition.call_args.kwargs["facts"]
+    assert passed_facts == {"high_value": True, "approved": True}
 
-    mock_case_repo.get_case.return_value = case
-    mock_rules_repo.get_active_rules.return_value = []
+    # No extra keys introduced
+    assert set(passed_facts.keys()) == {"high_value", "approved"}
 
-    with patch("core.workflow_orchestrator.evaluate_rules") as mock_rule_engine, \
-         patch("core.workflow_orchestrator.execute_transition") as mock_transition:
+    # Already-loaded state handed over (no second SELECT)
+    assert engines.execute_transition.call_args.kwargs["from_state_value"] == "pending_review"
 
-        mock_rule_engine.return_value = {"facts": {}, "trace": []}
-        mock_transition.return_value = {
-            "new_state": "approved",
-            "status": "SUCCESS",
-        }
+    # Output preserved
+    assert result["facts"] == passed_facts
+    assert result["to_state"] == "approved"
 
-        run_workflow_step(
-            case_id="C-789",
-            target_state="approved",
-            case_repository=mock_case_repo,
-            rules_repository=mock_rules_repo,
-        )
 
-        mock_rules_repo.get_active_rules.assert_called_once_with("mortgage_application")
+def _context_building_delegated(result, case, case_repo, rules_repo, engines):
+    """
+    Orchestrator must delegate context construction
+    to ContextBuilder and not inline logic.
+    """
 
-#Rule trace and audit entry must be preserved
-#This enforces full transparency.
+    engines.build_context.assert_called_once_with(case)
 
 
-def test_orchestrator_preserves_rule_trace_and_audit_entry():
+def _rules_loaded_by_case_type(result, case, case_repo, rules_repo, engines):
     """
-    Orchestrator must return full rule trace and audit entry
-    without modification.
+    Rules must be fetched strictly by case_type.
+    No defaults or fallbacks allowed.
     """
 
-    mock_case_repo = Mock()
-    mock_rules_repo = Mock()
+    assert rules_repo.calls == [("mortgage_application",)]
 
-    case = Case(
-        case_id="C-999",
-        current_state="review",
-        case_type="test",
-        data={},
-    )
 
-    mock_case_repo.get_case.return_value = case
-    mock_rules_repo.get_active_rules.return_value = []
+_RULE_TRACE = [
+    {"rule_id": "R1", "status": "EVALUATED_TRUE"},
+    {"rule_id": "R2", "status": "SKIPPED_DISABLED"},
+]
+
+_AUDIT_ENTRY = {
+    "timestamp": "2024-01-01T10:00:00",
+    "actor": "system",
+}
+
+
+def _trace_and_audit_preserved(result, case, case_repo, rules_repo, engines):
+    """
+    Orchestrator must return full rule trace and audit entry
+    without modification (full transparency).
+    """
 
-    rule_trace = [
-        {"rule_id": "R1", "status": "EVALUATED_TRUE"},
-        {"rule_id": "R2", "status": "SKIPPED_DISABLED"},
-    ]
+    assert result["rule_trace"] == _RULE_TRACE
+    assert result["audit_entry"] == _AUDIT_ENTRY
+    assert result["facts"]["decision"] == "approve"
 
-    audit_entry = {
-        "timestamp": "2024-01-01T10:00:00",
-        "actor": "system",
-    }
 
-    with patch("core.workflow_orchestrator.evaluate_rules") as mock_rule_engine, \
-         patch("core.workflow_orchestrator.execute_transition") as mock_transition:
+def _case(*, case_id="", current_state="", case_type="", data=None):
+    """Scenario case; each gets its own data dict (Case is frozen, data is not)."""
+    return Case(
+        case_id=case_id,
+        current_state=current_state,
+        case_type=case_type,
+        data={} if data is None else data,
+    )
 
-        mock_rule_engine.return_value = {
-            "facts": {"decision": "approve"},
-            "trace": rule_trace,
-        }
 
-        mock_transition.return_value = {
+SCENARIOS = {
+    "passes_facts_unchanged": Scenario(
+        case=_case(
+            case_id="C-123",
+            current_state="pending_review",
+            case_type="loan_application",
+            data={"amount": 50000, "credit_score": 750},
+        ),
+        target_state="approved",
+        rules=[
+            {
+                "rule_id": "R-1",
+                "priority": 1,
+                "enabled": True,
+                "condition": {"field": "amount", "operator": ">", "value": 10000},
+                "output_fact": {"high_value": True},
+            }
+        ],
+        rule_result={
+            "facts": {"high_value": True, "approved": True},
+            "trace": [{"rule_id": "R-1", "status": "EVALUATED_TRUE"}],
+        },
+        transition_result={
             "new_state": "approved",
             "status": "SUCCESS",
-            "audit_entry": audit_entry,
-        }
-
-        result = run_workflow_step(
+            "audit_entry": {"action": "approve"},
+        },
+        check=_facts_passed_unchanged,
+    ),
+    "delegates_context_building": Scenario(
+        case=_case(
+            case_id="C-456",
+            current_state="draft",
+            case_type="claim_review",
+            data={"claim_amount": 5000},
+        ),
+        target_state="submitted",
+        rules=[],
+        rule_result={"facts": {}, "trace": []},
+        transition_result={"new_state": "submitted", "status": "SUCCESS"},
+        check=_context_building_delegated,
+    ),
+    "loads_rules_by_case_type": Scenario(
+        case=_case(
+            case_id="C-789",
+            current_state="pending",
+            case_type="mortgage_application",
+        ),
+        target_state="approved",
+        rules=[],
+        rule_result={"facts": {}, "trace": []},
+        transition_result={"new_state": "approved", "status": "SUCCESS"},
+        check=_rules_loaded_by_case_type,
+    ),
+    "preserves_rule_trace_and_audit_entry": Scenario(
+        case=_case(
             case_id="C-999",
-            target_state="approved",
-            case_repository=mock_case_repo,
-            rules_repository=mock_rules_repo,
-        )
-
-        assert result["rule_trace"] == rule_trace
-        assert result["audit_entry"] == audit_entry
-        assert result["facts"]["decision"] == "approve"
\ No newline at end of file
+            current_state="review",
+            case_type="test",
+        ),
+        target_state="approved",
+        rules=[],
+        rule_result={"facts": {"decision": "approve"}, "trace": _RULE_TRACE},
+        transition_result={
+            "new_state": "approved",
+            "status": "SUCCESS",
+            "audit_entry": _AUDIT_ENTRY,
+        },
+        check=_trace_and_audit_preserved,
+    ),
+}
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS.values(), ids=SCENARIOS.keys())
+def test_orchestrator(scenario, repos, engines):
+    case_repo, rules_repo = repos
+
+    case_repo.case = scenario.case
+    rules_repo.rules = scenario.rules
+    engines.evaluate_rules.return_value = scenario.rule_result
+    engines.execute_transition.return_value = scenario.transition_result
+
+    result = run_workflow_step(
+        case_id=scenario.case.case_id,
+        target_state=scenario.target_state,
+        case_repository=case_repo,
+        rules_repository=rules_repo,
+    )
+
+    # Case fetched exactly once, by id
+    assert case_repo.calls == [(scenario.case.case_id,)]
+
+    scenario.check(result, scenario.case, case_repo, rules_repo, engines)
+
+
+# -----------------------------------------------------------------------------
+# Batch orchestration
+# -----------------------------------------------------------------------------
+
+_BATCH_CASE = _case(
+    case_id="C-B1",
+    current_state="CREATED",
+    case_type="loan_application",
+)
+
+
+@pytest.mark.parametrize(
+    "transition_result, from_state",
+    [
+        # The case moved on after it was fetched: report what the engine saw
+        (
+            {
+                "new_state": "APPROVED",
+                "status": "SUCCESS",
+                "audit_entry": {"from_state": "UNDER_REVIEW", "to_state": "APPROVED"},
+            },
+            "UNDER_REVIEW",
+        ),
+        # Already in the target state: nothing moved
+        ({"new_state": "APPROVED", "status": "NOOP", "audit_entry": None}, "APPROVED"),
+    ],
+    ids=["stale_repository_state", "noop"],
+)
+def test_batch_reports_transitioned_from_state(repos, engines, transition_result, from_state):
+    case_repo, rules_repo = repos
+
+    case_repo.case = _BATCH_CASE
+    engines.evaluate_rules.return_value = {"facts": {"approved": True}, "trace": []}
+    engines.execute_transitions.return_value = [transition_result]
+
+    [result] = run_workflow_steps(
+        steps=[{"case_id": "C-B1", "target_state": "APPROVED"}],
+        case_repository=case_repo,
+        rules_repository=rules_repo,
+    )
+
+    engines.execute_transitions.assert_called_once_with(requests=[
+        {"case_id": "C-B1", "action": "APPROVED", "facts": {"approved": True}},
+    ])
+    assert rules_repo.calls == [("loan_application",)]
+    # The batch hands ContextBuilder one explicit reference date
+    assert engines.build_context.call_args.kwargs["today"] is not None
+    assert result["from_state"] == from_state
+    assert result["to_state"] == "APPROVED"
+    assert result["transition_status"] == transition_result["status"]
+    assert result["audit_entry"] == transition_result["audit_entry"]
+
+
+def test_batch_compiles_rules_once_per_case_type(repos, engines):
+    case_repo, rules_repo = repos
+
+    case_repo.case = _BATCH_CASE
+    engines.evaluate_rules.return_value = {"facts": {}, "trace": []}
+    engines.execute_transitions.return_value = [
+        {"new_state": "APPROVED", "status": "NOOP", "audit_entry": None},
+    ] * 2
+
+    run_workflow_steps(
+        steps=[
+            {"case_id": "C-B1", "target_state": "APPROVED"},
+            {"case_id": "C-B2", "target_state": "APPROVED"},
+        ],
+        case_repository=case_repo,
+        rules_repository=rules_repo,
+    )
+
+    assert rules_repo.calls == [("loan_application",)]
+    first, second = (c.kwargs["rules"] for c in engines.evaluate_rules.call_args_list)
+    assert isinstance(first, CompiledRuleSet)
+    assert second is first
+
+
+def test_step_uses_repository_compiled_rules(repos, engines, mock_factory):
+    case_repo, _ = repos
+    compiled = CompiledRuleSet([])
+    rules_repo = mock_factory()
+    rules_repo.get_compiled_rules.return_value = compiled
+
+    case_repo.case = _BATCH_CASE
+    engines.evaluate_rules.return_value = {"facts": {}, "trace": []}
+    engines.execute_transition.return_value = {"new_state": "APPROVED", "status": "SUCCESS"}
+
+    run_workflow_step(
+        case_id="C-B1",
+        target_state="APPROVED",
+        case_repository=case_repo,
+        rules_repository=rules_repo,
+    )
+
+    rules_repo.get_compiled_rules.assert_called_once_with("loan_application")
+    rules_repo.get_active_rules.assert_not_called()
+    assert engines.evaluate_rules.call_args.kwargs["rules"] is compiled